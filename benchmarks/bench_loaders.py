@@ -0,0 +1,173 @@
+"""
+Offline benchmark for the dashboard's loaders and radar processing.
+
+Populates a local DynamoDB stand-in with synthetic trading days and reports p50/p95 latency
+and peak Python memory for every loader, process_radar_data and the incremental radar update.
+
+    python benchmarks/bench_loaders.py --stocks 200 --interval 1 --days 1 --repeat 5
+
+Uses moto in-process by default; pass --endpoint-url http://localhost:8000 to run against DynamoDB Local.
+"""
+import os
+import sys
+import copy
+import time
+import json
+import argparse
+import logging
+import tracemalloc
+from datetime import datetime, timedelta
+import numpy as np
+import pytz
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_day import generate_day, generate_swing, create_table, populate, LIVE_TIME_INDEX
+
+BENCH_TABLE = "SentAlertsBench"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stocks", type=int, default=200)
+    parser.add_argument("--interval", type=int, default=1, help="minutes between snapshots")
+    parser.add_argument("--days", type=int, default=1, help="trading days to generate, ending today")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--endpoint-url", default=None, help="DynamoDB Local endpoint (default: in-process moto)")
+    parser.add_argument("--json", dest="json_path", default=None, help="also write results to this file")
+    return parser.parse_args()
+
+def measure(fn, repeat, setup=None):
+    """
+    Wall times (s) over `repeat` runs, then one extra traced run for peak memory (MiB).
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        result = fn(arg) if setup else fn()
+        times.append(time.perf_counter() - start)
+
+    arg = setup() if setup else None
+    tracemalloc.start()
+    fn(arg) if setup else fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return times, peak / 2 ** 20, result
+
+def _count(result):
+    if result is None: return "-"
+    return len(result)
+
+def run_benchmarks(args):
+    import view_signals as vs
+    from radar_engine import RadarState, process_radar_data
+    from dynamo_access import get_dynamodb, query_partition
+    from live_index import DynamoTimeIndex, live_partition
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    today = datetime.now(pytz.timezone("Asia/Kolkata")).date()
+
+    def clear_all():
+        for loader in [vs.load_data_from_dynamodb, vs.load_latest_live_slice, vs.load_lock_data,
+                       vs.load_daily_ai_registry, vs.load_cumulative_scores, vs.load_swing_candidates]:
+            loader.clear()
+        vs.get_history_store.clear()
+
+    # Raw HISTORY#BOOST items, for the from-scratch processing cases
+    history = list(query_partition(get_dynamodb().Table(BENCH_TABLE), f"HISTORY#BOOST#{today.isoformat()}"))
+    scores = vs.load_cumulative_scores(today)
+    warm_state = RadarState().apply(history[:-1])
+    time_index = DynamoTimeIndex(get_dynamodb().Table(BENCH_TABLE), LIVE_TIME_INDEX)
+    live_key = live_partition("INTRADAY_BOOST", today.isoformat())
+
+    cases = [
+        ("load_todays_history_optimized (cold)", lambda: vs.load_todays_history_optimized(today), clear_all),
+        ("load_todays_history_optimized (delta)", lambda: vs.load_todays_history_optimized(today), None),
+        ("load_data_from_dynamodb", lambda: vs.load_data_from_dynamodb(today), clear_all),
+        ("load_data_from_dynamodb (velocity cols)",
+         lambda: vs.load_data_from_dynamodb(today, "INTRADAY_BOOST", vs.VELOCITY_ATTRIBUTES), clear_all),
+        ("load_latest_live_slice (local index)",
+         lambda: vs.load_latest_live_slice(today, "INTRADAY_BOOST", vs.VELOCITY_ATTRIBUTES), clear_all),
+        ("DynamoTimeIndex.latest (GSI)", lambda: time_index.latest(live_key, vs.VELOCITY_ATTRIBUTES), None),
+        ("load_lock_data", lambda: vs.load_lock_data(today), clear_all),
+        ("load_daily_ai_registry", lambda: vs.load_daily_ai_registry(today), clear_all),
+        ("load_cumulative_scores", lambda: vs.load_cumulative_scores(today), clear_all),
+        ("load_swing_candidates", lambda: vs.load_swing_candidates(today), clear_all),
+        ("process_radar_data (full day)", lambda: process_radar_data(history, scores), None),
+        ("RadarState.apply (1 snapshot)", lambda state: state.apply(history[-1:]).to_frame(scores),
+         lambda: copy.deepcopy(warm_state)),
+    ]
+
+    rows = []
+    for name, fn, setup in cases:
+        if setup is clear_all:
+            times, peak, result = measure(lambda _: fn(), args.repeat, setup=clear_all)
+        elif setup is not None:
+            times, peak, result = measure(fn, args.repeat, setup=setup)
+        else:
+            times, peak, result = measure(fn, args.repeat)
+        rows.append({
+            "case": name,
+            "items": _count(result),
+            "p50_ms": float(np.percentile(times, 50)) * 1000,
+            "p95_ms": float(np.percentile(times, 95)) * 1000,
+            "peak_mib": peak,
+        })
+    return rows
+
+def print_report(rows, args):
+    print(f"\nstocks={args.stocks} interval={args.interval}m days={args.days} repeat={args.repeat}\n")
+    print(f"{'case':<42}{'items':>8}{'p50 ms':>11}{'p95 ms':>11}{'peak MiB':>11}")
+    for r in rows:
+        print(f"{r['case']:<42}{str(r['items']):>8}{r['p50_ms']:>11.1f}{r['p95_ms']:>11.1f}{r['peak_mib']:>11.1f}")
+
+def main():
+    args = parse_args()
+
+    # Loaders read their config at import time, so point them at the bench table first
+    os.environ["DYNAMODB_TABLE"] = BENCH_TABLE
+    os.environ["DAY_CACHE"] = "0"
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "ap-south-1")
+    if args.endpoint_url:
+        os.environ["DYNAMODB_ENDPOINT_URL"] = args.endpoint_url
+    else:
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+
+    mock = None
+    if not args.endpoint_url:
+        from moto import mock_aws
+        mock = mock_aws()
+        mock.start()
+
+    try:
+        from dynamo_access import get_dynamodb
+        dynamodb = get_dynamodb()
+        if BENCH_TABLE in dynamodb.meta.client.list_tables()["TableNames"]:
+            dynamodb.Table(BENCH_TABLE).delete()
+            dynamodb.meta.client.get_waiter("table_not_exists").wait(TableName=BENCH_TABLE)
+        table = create_table(dynamodb, BENCH_TABLE)
+        table.wait_until_exists()
+
+        today = datetime.now(pytz.timezone("Asia/Kolkata")).date()
+        start = time.perf_counter()
+        for offset in range(args.days):
+            populate(table, generate_day(today - timedelta(days=offset), args.stocks, args.interval))
+        populate(table, generate_swing(args.stocks, args.days))
+        print(f"populated {args.days} day(s) in {time.perf_counter() - start:.1f}s")
+
+        rows = run_benchmarks(args)
+        print_report(rows, args)
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump({"args": vars(args), "results": rows}, f, indent=2)
+    finally:
+        if mock:
+            mock.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import json
+import random
+from decimal import Decimal
+from datetime import datetime, timedelta
+from live_index import LIVE_INDEX_KEY, live_partition
+
+# --- SYNTHETIC TRADING DAYS ---
+# Items shaped like the ones the backend writes to SentAlerts, for benchmarks and offline runs.
+
+MARKET_OPEN = "09:15"
+MARKET_MINUTES = 375
+BREAK_TYPES = ["INSIDE", "INSIDE", "NEAR PDH", "NEAR PDL", "BROKE PDH", "BROKE PDL"]
+LIVE_TIME_INDEX = "LiveByTime"
+
+def _dec(x):
+    return Decimal(str(round(x, 2)))
+
+def snapshot_times(interval=1):
+    start = datetime.strptime(MARKET_OPEN, "%H:%M")
+    return [(start + timedelta(minutes=m)).strftime("%H:%M:%S") for m in range(0, MARKET_MINUTES, interval)]
+
+def stock_names(stocks):
+    return [f"SYNTH {i:03d} INDUSTRIES LTD" for i in range(stocks)]
+
+def generate_day(day, stocks=200, interval=1, seed=0):
+    """
+    All date-keyed partitions for one day: HISTORY#BOOST, INST#...#LIVE, CUMULATIVE_SCORE,
+    DAILY_UNIQUE_LOCK and AI_DAILY_ALERT.
+    """
+    rnd = random.Random(f"{seed}-{day.isoformat()}")
+    date_str = day.isoformat()
+    names = stock_names(stocks)
+    state = {
+        name: {"price": rnd.uniform(100, 3000), "oi": 0.0, "best": 0.0, "key": f"NSE_FO|{50000 + i}"}
+        for i, name in enumerate(names)
+    }
+    selected = set(rnd.sample(names, max(1, stocks // 20)))
+
+    items = []
+    latest = {}
+    for t in snapshot_times(interval):
+        data = []
+        for name in names:
+            s = state[name]
+            s["price"] *= 1 + rnd.gauss(0, 0.002)
+            s["oi"] += rnd.gauss(0.02, 0.3)
+            score = max(0.0, min(100.0, abs(s["oi"]) * 8 + rnd.uniform(0, 15)))
+            s["best"] = max(s["best"], score)
+            stock = {
+                "Name": name,
+                "InstrumentKey": s["key"],
+                "SignalPrice": round(s["price"], 2),
+                "OI_Change": round(s["oi"], 2),
+                "BreakType": rnd.choice(BREAK_TYPES),
+                "Score": round(score, 1),
+                "AI_Decision": "N/A",
+                "Option_PCR": f"{rnd.uniform(0.5, 1.5):.2f}",
+                "Option_MaxPain": str(int(s["price"] // 10 * 10)),
+            }
+            if name in selected and rnd.random() < 0.05:
+                stock["AI_Decision"] = "AI_SELECTED"
+                stock["AI_Reason"] = f"OI build-up with {stock['BreakType'].lower()} and rising volume at {t}. " * 4
+            data.append(stock)
+            latest[name] = (t, stock)
+        items.append({"PK": f"HISTORY#BOOST#{date_str}", "SK": t, "Data": json.dumps(data)})
+
+    for name, (t, stock) in latest.items():
+        oi = stock["OI_Change"]
+        items.append({
+            "PK": f"INST#{state[name]['key']}#{date_str}",
+            "SK": "SIGNAL#INTRADAY_BOOST#LIVE",
+            "Signal": "INTRADAY_BOOST",
+            "Name": name,
+            "InstrumentKey": state[name]["key"],
+            "Time": t,
+            LIVE_INDEX_KEY: live_partition("INTRADAY_BOOST", date_str),
+            "SignalPrice": _dec(stock["SignalPrice"]),
+            "OI_Change": _dec(oi),
+            "BreakType": stock["BreakType"],
+            "Side": "BULLISH" if oi > 0 else "BEARISH",
+            "RankType": "TOP GAINER" if oi > 0 else "TOP LOSER",
+            "AI_Decision": "AI_SELECTED" if name in selected else "N/A",
+            "AI_Reason": f"Synthetic verdict for {name}. " * 10,
+            "AI_Confidence": _dec(rnd.uniform(60, 95)),
+            "Target": _dec(stock["SignalPrice"] * 1.02),
+            "StopLoss": _dec(stock["SignalPrice"] * 0.99),
+            "RiskReward": "1:2",
+            "Live_Move": _dec(rnd.uniform(-2, 3)),
+            "Option_PCR": stock["Option_PCR"],
+            "Option_MaxPain": stock["Option_MaxPain"],
+        })
+        items.append({"PK": f"CUMULATIVE_SCORE#{date_str}", "SK": name, "Best_Score": _dec(state[name]["best"])})
+
+    for name in selected:
+        items.append({"PK": f"AI_DAILY_ALERT#{date_str}", "SK": name})
+        items.append({
+            "PK": f"DAILY_UNIQUE_LOCK#{date_str}", "SK": name, "Stock": name,
+            "Lock_Time": latest[name][0], "Reentry_Time": None,
+        })
+    return items
+
+def generate_swing(stocks=200, days=1, seed=0):
+    """
+    SWING_ACTIVE candidates and SWING_HISTORY closed trades.
+    """
+    rnd = random.Random(seed)
+    names = stock_names(stocks)
+    items = []
+    for name in rnd.sample(names, max(1, stocks // 10)):
+        items.append({
+            "PK": "SWING_ACTIVE", "SK": name, "Symbol": name,
+            "Direction": rnd.choice(["LONG", "SHORT"]), "Confidence": _dec(rnd.uniform(40, 95)),
+            "Setup": "BREAKOUT", "Status": "ACTIVE", "Close": _dec(rnd.uniform(100, 3000)),
+        })
+    for i in range(max(1, stocks // 4) * days):
+        entry = datetime(2026, 1, 1) + timedelta(days=i % 250)
+        items.append({
+            "PK": "SWING_HISTORY", "SK": f"{entry.date().isoformat()}#{i}", "Symbol": rnd.choice(names),
+            "Direction": rnd.choice(["LONG", "SHORT"]),
+            "Entry_Date": entry.date().isoformat(), "Exit_Date": (entry + timedelta(days=5)).date().isoformat(),
+            "ReturnPct": _dec(rnd.gauss(0.5, 3)), "Holding_Days": Decimal(rnd.randint(1, 10)), "Exit_Reason": "TARGET",
+        })
+    return items
+
+def create_table(dynamodb, table_name):
+    """
+    SentAlerts layout plus the live signal items' Time index (LIVE_TIME_INDEX).
+    """
+    return dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[{"AttributeName": "PK", "KeyType": "HASH"}, {"AttributeName": "SK", "KeyType": "RANGE"}],
+        AttributeDefinitions=[
+            {"AttributeName": name, "AttributeType": "S"} for name in ["PK", "SK", LIVE_INDEX_KEY, "Time"]
+        ],
+        GlobalSecondaryIndexes=[{
+            "IndexName": LIVE_TIME_INDEX,
+            "KeySchema": [{"AttributeName": LIVE_INDEX_KEY, "KeyType": "HASH"}, {"AttributeName": "Time", "KeyType": "RANGE"}],
+            "Projection": {"ProjectionType": "ALL"},
+        }],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+def populate(table, items):
+    with table.batch_writer(overwrite_by_pkeys=["PK", "SK"]) as writer:
+        for item in items:
+            writer.put_item(Item={k: v for k, v in item.items() if v is not None})
@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import queue
+import logging
+import threading
+import boto3
+from botocore.exceptions import ClientError
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from dynamo_access import AWS_REGION, DYNAMODB_ENDPOINT_URL
+
+# --- CHANGE FEED ---
+# Pushes new table writes to the dashboard as they happen instead of waiting for the next 60 s poll.
+# Reads a DynamoDB Stream (StreamViewType NEW_IMAGE or NEW_AND_OLD_IMAGES), or, for offline runs,
+# a JSONL file / in-process queue of records in the same shape as the stream's Records[].
+
+FEED_POLL_SECONDS = float(os.getenv("RADAR_CHANGE_FEED_POLL", "1"))
+SHARD_REFRESH_SECONDS = 60
+# Times a batch whose apply() raised is handed back with the next read before it is dropped
+FEED_APPLY_RETRIES = 3
+
+logger = logging.getLogger(__name__)
+_deserializer = TypeDeserializer()
+_serializer = TypeSerializer()
+
+def new_images(records):
+    """
+    Plain items (as the boto3 resource returns them) for the INSERT/MODIFY records of a batch.
+    """
+    images = []
+    for record in records:
+        image = record.get("dynamodb", {}).get("NewImage")
+        if record.get("eventName") in ("INSERT", "MODIFY") and image:
+            images.append({k: _deserializer.deserialize(v) for k, v in image.items()})
+    return images
+
+def to_record(item, event_name="INSERT"):
+    return {
+        "eventName": event_name,
+        "dynamodb": {
+            "Keys": {k: _serializer.serialize(item[k]) for k in ("PK", "SK")},
+            "NewImage": {k: _serializer.serialize(v) for k, v in item.items() if v is not None},
+        },
+    }
+
+def append_records(path, items, event_name="INSERT"):
+    """
+    Writes items to a file feed as stream records, e.g. to replay a synthetic day into a running dashboard.
+    """
+    with open(path, "a") as f:
+        for item in items:
+            f.write(json.dumps(to_record(item, event_name)) + "\n")
+
+class FileStreamSource:
+    """
+    Tails a JSONL file of stream records, starting at its current end (like a LATEST shard iterator).
+    """
+    def __init__(self, path):
+        self.path = path
+        self._offset = os.path.getsize(path) if os.path.exists(path) else 0
+
+    def read(self):
+        if not os.path.exists(self.path):
+            return []
+        if os.path.getsize(self.path) < self._offset:
+            self._offset = 0  # truncated or replaced
+        with open(self.path) as f:
+            f.seek(self._offset)
+            lines = []
+            for line in iter(f.readline, ""):
+                if not line.endswith("\n"):
+                    break  # partially written line, picked up on the next read
+                lines.append(line)
+                self._offset = f.tell()
+        return [json.loads(line) for line in lines if line.strip()]
+
+class QueueStreamSource:
+    """
+    Drains stream records put on an in-process queue.
+    """
+    def __init__(self, records=None):
+        self.records = records or queue.Queue()
+
+    def read(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self.records.get_nowait())
+            except queue.Empty:
+                return batch
+
+class DynamoDBStreamSource:
+    """
+    Reads every open shard of a DynamoDB Stream. Shards present at startup are read from LATEST;
+    shards that appear later (splits, rollovers) are read from TRIM_HORIZON so no write is skipped.
+    An expired iterator is reopened after the last record read from its shard.
+    """
+    def __init__(self, stream_arn, client=None):
+        self.stream_arn = stream_arn
+        self.client = client or boto3.client("dynamodbstreams", region_name=AWS_REGION, endpoint_url=DYNAMODB_ENDPOINT_URL)
+        self._iterators = {}  # shard id -> next shard iterator
+        self._start_types = {}  # shard id -> iterator type it was first opened with
+        self._positions = {}  # shard id -> SequenceNumber of the last record read
+        self._finished = set()
+        self._discovered_at = None
+
+    def _open(self, shard_id):
+        params = {"StreamArn": self.stream_arn, "ShardId": shard_id}
+        if shard_id in self._positions:
+            params.update(ShardIteratorType="AFTER_SEQUENCE_NUMBER", SequenceNumber=self._positions[shard_id])
+        else:
+            params.update(ShardIteratorType=self._start_types[shard_id])
+        return self.client.get_shard_iterator(**params)["ShardIterator"]
+
+    def _discover(self):
+        shards = []
+        kwargs = {"StreamArn": self.stream_arn}
+        while True:
+            description = self.client.describe_stream(**kwargs)["StreamDescription"]
+            shards.extend(description.get("Shards", []))
+            if "LastEvaluatedShardId" not in description:
+                break
+            kwargs["ExclusiveStartShardId"] = description["LastEvaluatedShardId"]
+
+        iterator_type = "LATEST" if self._discovered_at is None else "TRIM_HORIZON"
+        for shard in shards:
+            shard_id = shard["ShardId"]
+            if shard_id in self._iterators or shard_id in self._finished:
+                continue
+            self._start_types.setdefault(shard_id, iterator_type)
+            self._iterators[shard_id] = self._open(shard_id)
+        self._discovered_at = time.monotonic()
+
+    def read(self):
+        if self._discovered_at is None or time.monotonic() - self._discovered_at > SHARD_REFRESH_SECONDS:
+            self._discover()
+
+        records = []
+        for shard_id, iterator in list(self._iterators.items()):
+            try:
+                response = self.client.get_records(ShardIterator=iterator, Limit=1000)
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ExpiredIteratorException":
+                    raise
+                # Resume after the last record read, not from the start of the shard's 24 h window
+                # (if reopening fails, the next discovery retries it from the same position)
+                del self._iterators[shard_id]
+                self._iterators[shard_id] = self._open(shard_id)
+                continue
+            shard_records = response.get("Records", [])
+            if shard_records:
+                self._positions[shard_id] = shard_records[-1]["dynamodb"]["SequenceNumber"]
+            records.extend(shard_records)
+            if response.get("NextShardIterator"):
+                self._iterators[shard_id] = response["NextShardIterator"]
+            else:
+                del self._iterators[shard_id]
+                self._finished.add(shard_id)
+        return records
+
+def open_source(spec):
+    """
+    A stream ARN reads the DynamoDB Stream; anything else is the path of a JSONL file feed.
+    """
+    if spec.startswith("arn:"):
+        return DynamoDBStreamSource(spec)
+    return FileStreamSource(spec)
+
+class ChangeFeed:
+    """
+    Daemon thread handing each batch of new items to apply(items), which folds them into the in-memory
+    state and returns the (view, date) keys they changed. Each changed key's version is bumped, so a
+    session only reruns when the version of what it shows moves.
+    A batch whose apply() raised is retried with the next read (apply must tolerate seeing items twice).
+    """
+    def __init__(self, source, apply, interval=FEED_POLL_SECONDS, name="change-feed"):
+        self.source = source
+        self.apply = apply
+        self.interval = interval
+        self.records_seen = 0
+        self.last_change_at = None
+        self.last_error = None
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def version(self, view, target_date):
+        with self._lock:
+            return self._versions.get((view, target_date), 0)
+
+    def _run(self):
+        pending, failures = [], 0
+        while not self._stop.is_set():
+            records = []
+            try:
+                records = pending + self.source.read()
+                items = new_images(records)
+                changed = self.apply(items) if items else set()
+                with self._lock:
+                    self.records_seen += len(records)
+                    for key in changed:
+                        self._versions[key] = self._versions.get(key, 0) + 1
+                    if changed:
+                        self.last_change_at = time.time()
+                pending, failures = [], 0
+                self.last_error = None
+            except Exception as e:
+                self.last_error = repr(e)
+                logger.exception("Change feed read failed")
+                if records:
+                    # Read but not applied: hand the batch back with the next read, a few times at most
+                    failures += 1
+                    pending = records if failures <= FEED_APPLY_RETRIES else []
+                    if not pending:
+                        logger.error("Dropping %d change feed records after %d failed applies", len(records), failures - 1)
+                        failures = 0
+            # Keep reading while records are flowing; back off when the feed is idle or failing
+            if not records or self.last_error:
+                self._stop.wait(self.interval)
@@ -0,0 +1,51 @@
+import os
+import re
+import pickle
+import threading
+from datetime import datetime
+import pytz
+
+# --- CLOSED-DAY DISK CACHE ---
+# Partitions of a finished trading day never change, so they are fetched once and then served from disk.
+# Raw items are pickled as-is (Decimals and JSON blobs included), so every loader keeps its own parsing.
+
+DAY_CACHE_DIR = os.getenv("DAY_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".day_cache"))
+DAY_CACHE_ENABLED = os.getenv("DAY_CACHE", "1") == "1"
+INDIA_TZ = pytz.timezone('Asia/Kolkata')
+
+def is_closed_day(target_date):
+    return target_date < datetime.now(INDIA_TZ).date()
+
+def _cache_path(table_name, pk, target_date):
+    safe_pk = re.sub(r'[^A-Za-z0-9_.-]', '_', pk)
+    return os.path.join(DAY_CACHE_DIR, table_name, target_date.isoformat(), f"{safe_pk}.pkl")
+
+def cached_items(table_name, pk, target_date, fetch):
+    """
+    Returns fetch() for today; for closed days reads the items from disk, fetching and storing them on first use.
+    Empty results and partial ones (a `missing` attribute listing unread keys) are not stored,
+    so a late backfill or the unread keys are picked up on the next fetch.
+    """
+    if not DAY_CACHE_ENABLED or not is_closed_day(target_date):
+        return fetch()
+
+    path = _cache_path(table_name, pk, target_date)
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass  # Unreadable file: fetch again and overwrite it
+
+    items = fetch()
+    if items and not getattr(items, 'missing', None):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(items, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # Cache is best-effort; the fetched items are still returned
+    return items
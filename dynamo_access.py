@@ -0,0 +1,162 @@
+import os
+import time
+import random
+import logging
+import threading
+import contextvars
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from boto3.dynamodb.conditions import Key
+from instrumentation import install_dynamodb_hooks
+
+# --- DYNAMODB ACCESS LAYER ---
+# One process-wide resource (and so one HTTPS connection pool) shared by every loader.
+
+AWS_REGION = os.getenv("AWS_REGION", "ap-south-1")
+DYNAMODB_POOL_SIZE = int(os.getenv("DYNAMODB_POOL_SIZE", "32"))
+DYNAMODB_KEEPALIVE = os.getenv("DYNAMODB_KEEPALIVE", "1") == "1"
+# Point at DynamoDB Local (e.g. http://localhost:8000) for offline runs and benchmarks
+DYNAMODB_ENDPOINT_URL = os.getenv("DYNAMODB_ENDPOINT_URL") or None
+
+BATCH_GET_LIMIT = 100
+BATCH_GET_WORKERS = int(os.getenv("BATCH_GET_WORKERS", "4"))
+BATCH_GET_RETRIES = 5
+BATCH_GET_BACKOFF = 0.05
+
+# Keys batch_get_items could not read: 'unprocessed' (still throttled after the retries), 'failed' (request error)
+BATCH_GET_STATS = Counter()
+
+logger = logging.getLogger(__name__)
+_lock = threading.Lock()
+_dynamodb = None
+
+def get_dynamodb():
+    """
+    Shared DynamoDB resource with a pooled, keep-alive connection.
+    Credentials are resolved and TLS connections opened once per process, not per loader call.
+    """
+    global _dynamodb
+    if _dynamodb is None:
+        with _lock:
+            if _dynamodb is None:
+                config = Config(
+                    region_name=AWS_REGION,
+                    max_pool_connections=DYNAMODB_POOL_SIZE,
+                    tcp_keepalive=DYNAMODB_KEEPALIVE,
+                    retries={"max_attempts": 3, "mode": "standard"}
+                )
+                dynamodb = boto3.session.Session().resource(
+                    "dynamodb", config=config, endpoint_url=DYNAMODB_ENDPOINT_URL
+                )
+                install_dynamodb_hooks(dynamodb.meta.client)
+                _dynamodb = dynamodb
+    return _dynamodb
+
+class BatchItems(list):
+    """
+    Items of a batch get; `missing` lists the keys that could not be read.
+    """
+    def __init__(self, items=(), missing=()):
+        super().__init__(items)
+        self.missing = list(missing)
+
+def _batch_get_chunk(client, table_name, keys, attributes=None):
+    """
+    Runs one BatchGetItem call, retrying UnprocessedKeys with exponential backoff.
+    Returns (items, missing keys). A failed request loses only its own chunk's remaining keys.
+    """
+    items = []
+    request = {table_name: dict({"Keys": keys}, **(projection(attributes) if attributes else {}))}
+    for attempt in range(BATCH_GET_RETRIES + 1):
+        try:
+            resp = client.batch_get_item(RequestItems=request)
+        except (ClientError, BotoCoreError) as e:
+            missing = request[table_name]["Keys"]
+            BATCH_GET_STATS['failed'] += len(missing)
+            logger.warning("BatchGetItem on %s failed, %d keys not read: %r", table_name, len(missing), e)
+            return items, missing
+        items.extend(resp.get("Responses", {}).get(table_name, []))
+        request = resp.get("UnprocessedKeys") or {}
+        if not request:
+            return items, []
+        if attempt < BATCH_GET_RETRIES:
+            time.sleep(min(BATCH_GET_BACKOFF * (2 ** attempt), 2.0) * random.uniform(0.5, 1.0))
+
+    missing = request[table_name]["Keys"]
+    BATCH_GET_STATS['unprocessed'] += len(missing)
+    logger.warning("BatchGetItem on %s left %d keys unprocessed after %d retries", table_name, len(missing), BATCH_GET_RETRIES)
+    return items, missing
+
+def batch_get_items(dynamodb, table_name, keys, attributes=None):
+    """
+    Fetches items in BatchGetItem chunks of up to 100 keys, running the chunks concurrently.
+    attributes, if given, limits each item to those attributes (ProjectionExpression).
+    Returns BatchItems: keys still unprocessed after the retries, or in a chunk whose request failed,
+    are skipped and listed in `missing`.
+    """
+    chunks = [keys[i:i + BATCH_GET_LIMIT] for i in range(0, len(keys), BATCH_GET_LIMIT)]
+    if not chunks:
+        return BatchItems()
+
+    # meta.client keeps the resource's type conversion and, unlike the resource, is thread-safe
+    client = dynamodb.meta.client
+    # Each chunk runs in a copy of the caller's context so its traffic is attributed to the caller's span
+    contexts = [contextvars.copy_context() for _ in chunks]
+    with ThreadPoolExecutor(max_workers=min(BATCH_GET_WORKERS, len(chunks))) as pool:
+        results = list(pool.map(lambda ctx, chunk: ctx.run(_batch_get_chunk, client, table_name, chunk, attributes), contexts, chunks))
+    return BatchItems(
+        [item for chunk_items, _ in results for item in chunk_items],
+        [key for _, chunk_missing in results for key in chunk_missing]
+    )
+
+def projection(attributes):
+    """
+    ProjectionExpression params for a list of attribute names (placeholders, since Data, Name, Time... are reserved words).
+    """
+    names = {f"#p{i}": name for i, name in enumerate(attributes)}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+def query_pages(table, key_condition, attributes=None, prefetch=False, **kwargs):
+    """
+    Generator over every page of a query, following LastEvaluatedKey.
+    With prefetch=True the next page is requested in the background while the caller works on the current one.
+    """
+    # meta.client keeps the resource's type conversion and condition building, and is thread-safe
+    client = table.meta.client
+    params = dict(TableName=table.name, KeyConditionExpression=key_condition, **kwargs)
+    if attributes:
+        params.update(projection(attributes))
+
+    def fetch(start_key):
+        page_params = dict(params, ExclusiveStartKey=start_key) if start_key else params
+        return client.query(**page_params)
+
+    if not prefetch:
+        response = fetch(None)
+        while True:
+            yield response.get("Items", [])
+            if "LastEvaluatedKey" not in response:
+                return
+            response = fetch(response["LastEvaluatedKey"])
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # Page requests run in a copy of the caller's context so their traffic lands in the caller's span
+        future = pool.submit(contextvars.copy_context().run, fetch, None)
+        while future is not None:
+            response = future.result()
+            next_key = response.get("LastEvaluatedKey")
+            future = pool.submit(contextvars.copy_context().run, fetch, next_key) if next_key else None
+            yield response.get("Items", [])
+
+def query_partition(table, pk, sk_condition=None, attributes=None, prefetch=False, **kwargs):
+    """
+    Streams every item of one partition, page by page; sk_condition narrows it (e.g. Key('SK').gt(last_sk)).
+    """
+    condition = Key("PK").eq(pk)
+    if sk_condition is not None:
+        condition = condition & sk_condition
+    for page in query_pages(table, condition, attributes=attributes, prefetch=prefetch, **kwargs):
+        yield from page
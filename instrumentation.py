@@ -0,0 +1,94 @@
+import os
+import time
+import json
+import threading
+import contextvars
+from collections import deque
+from functools import wraps
+
+# --- HOT-PATH INSTRUMENTATION ---
+# Every instrumented call records a span: wall time, items returned and the DynamoDB traffic made inside it
+# (requests, response bytes, consumed read capacity). Loader spans with no DynamoDB request count as cache hits.
+
+METRICS_LOG_PATH = os.getenv("RADAR_METRICS_LOG")
+EVENTS = deque(maxlen=int(os.getenv("RADAR_METRICS_EVENTS", "5000")))
+READ_OPERATIONS = {"Query", "GetItem", "BatchGetItem", "Scan"}
+
+_lock = threading.Lock()
+_current_span = contextvars.ContextVar("radar_span", default=None)
+
+def _size(result):
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+def record(span):
+    with _lock:
+        EVENTS.append(span)
+        if METRICS_LOG_PATH:
+            with open(METRICS_LOG_PATH, "a") as f:
+                f.write(json.dumps(span, default=str) + "\n")
+
+def instrumented(kind, name=None):
+    """
+    Decorator recording a span per call. kind is "load", "process" or "render".
+    """
+    def decorator(fn):
+        label = name or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            span = {"kind": kind, "name": label, "ts": time.time(), "requests": 0, "bytes": 0, "rcu": 0.0}
+            token = _current_span.set(span)
+            start = time.perf_counter()
+            result = None
+            try:
+                result = fn(*args, **kwargs)
+                return result
+            except Exception as e:
+                span["error"] = repr(e)
+                raise
+            finally:
+                _current_span.reset(token)
+                span["wall_ms"] = (time.perf_counter() - start) * 1000
+                span["items"] = _size(result)
+                if kind == "load":
+                    span["cache"] = "hit" if span["requests"] == 0 else "miss"
+                record(span)
+
+        # Keep st.cache_data's clear() reachable through the wrapper
+        if hasattr(fn, "clear"):
+            wrapper.clear = fn.clear
+        return wrapper
+    return decorator
+
+def _request_capacity(params, model, **kwargs):
+    if model.name in READ_OPERATIONS:
+        params.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+def _record_call(http_response, parsed, model, **kwargs):
+    span = _current_span.get()
+    if span is None:
+        return
+    capacity = parsed.get("ConsumedCapacity") or []
+    if isinstance(capacity, dict):
+        capacity = [capacity]
+    with _lock:
+        span["requests"] += 1
+        span["bytes"] += len(http_response.content or b"")
+        span["rcu"] += sum(float(c.get("CapacityUnits", 0)) for c in capacity)
+
+def install_dynamodb_hooks(client):
+    """
+    Asks DynamoDB for ConsumedCapacity on reads and attributes every call to the active span.
+    """
+    client.meta.events.register("before-parameter-build.dynamodb", _request_capacity)
+    client.meta.events.register("after-call.dynamodb", _record_call)
+
+def snapshot():
+    with _lock:
+        return list(EVENTS)
+
+def export_jsonl():
+    return "\n".join(json.dumps(span, default=str) for span in snapshot())
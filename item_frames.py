@@ -0,0 +1,73 @@
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+
+# --- TYPED ITEM FRAMES ---
+# DynamoDB items -> DataFrame with one schema per item type, converted a column at a time
+# instead of walking every item and value recursively.
+
+FLOAT = "float64"
+CATEGORY = "category"
+
+LIVE_SIGNAL_SCHEMA = {
+    "SignalPrice": FLOAT, "OI_Change": FLOAT, "AI_Confidence": FLOAT, "Live_Move": FLOAT,
+    "Signal": CATEGORY, "BreakType": CATEGORY, "Side": CATEGORY, "RankType": CATEGORY, "AI_Decision": CATEGORY,
+}
+CUMULATIVE_SCORE_SCHEMA = {"Best_Score": FLOAT}
+SWING_CANDIDATE_SCHEMA = {"Confidence": FLOAT, "Close": FLOAT}
+SWING_HISTORY_SCHEMA = {"ReturnPct": FLOAT, "Holding_Days": FLOAT}
+LOCK_COLUMNS = ["Lock Time", "Reentry"]
+
+def to_float(values):
+    """
+    Decimals, numbers, numeric strings and None -> float64 in one NumPy cast.
+    Casting the Decimals directly is faster than parsing the wire format's number strings.
+    Falls back to a coercing parse (NaN) when the column holds non-numeric text.
+    """
+    values = np.asarray(values, dtype=object)
+    try:
+        return values.astype(np.float64)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
+
+def _plain_decimals(col):
+    # Columns outside the schema keep their values; only Decimals become floats
+    values = col.to_numpy()
+    if col.dtype != object or not any(isinstance(v, Decimal) for v in values):
+        return col
+    try:
+        return pd.Series(values.astype(np.float64), index=col.index, name=col.name)
+    except (TypeError, ValueError):
+        return col.map(lambda v: float(v) if isinstance(v, Decimal) else v)
+
+def items_frame(items, schema):
+    """
+    DataFrame of items with schema columns typed (float64 / category) and no Decimal left anywhere.
+    """
+    df = pd.DataFrame(items)
+    if df.empty:
+        return df
+    for col in df.columns:
+        kind = schema.get(col)
+        if kind == FLOAT:
+            df[col] = to_float(df[col].to_numpy())
+        elif kind == CATEGORY:
+            df[col] = df[col].astype(CATEGORY)
+        else:
+            df[col] = _plain_decimals(df[col])
+    return df
+
+def lock_frame(items):
+    """
+    DAILY_UNIQUE_LOCK items -> one row per locked stock, indexed by Stock, with LOCK_COLUMNS ("-" when unset).
+    """
+    df = items_frame(items, {})
+    if df.empty or "Stock" not in df.columns:
+        return pd.DataFrame(columns=LOCK_COLUMNS, index=pd.Index([], dtype=object, name="Stock"))
+    # Last item per stock wins, as the dict lookups did
+    df = df[df["Stock"].notna()].drop_duplicates("Stock", keep="last").set_index("Stock")
+    columns = {}
+    for col, attribute in zip(LOCK_COLUMNS, ["Lock_Time", "Reentry_Time"]):
+        values = df[attribute] if attribute in df.columns else pd.Series(None, index=df.index, dtype=object)
+        columns[col] = values.replace("", None).fillna("-").astype(str)
+    return pd.DataFrame(columns, index=df.index)
@@ -0,0 +1,75 @@
+import os
+import bisect
+from boto3.dynamodb.conditions import Key
+from dynamo_access import query_pages
+
+# --- LIVE SIGNAL TIME INDEX ---
+# The newest tick of the INST#...#LIVE signal items without reading every instrument's item.
+# DynamoDB: a GSI with partition key LIVE_INDEX_KEY ("<Signal>#<date>", written with each live item)
+# and sort key Time. One Limit-1 descending query finds the newest Time, a second reads that Time's items.
+# LocalTimeIndex answers the same lookups over items already in memory: the stand-in for tests,
+# benchmarks and tables without the GSI. Only the GSI reduces reads; the local index still needs
+# every live item fetched first.
+
+LIVE_INDEX_KEY = os.getenv("RADAR_LIVE_INDEX_KEY", "Live_Partition")
+
+def live_partition(signal, date_str):
+    return f"{signal}#{date_str}"
+
+class DynamoTimeIndex:
+    """
+    Time lookups on the live items' GSI.
+    """
+    def __init__(self, table, index_name, key=LIVE_INDEX_KEY):
+        self.table = table
+        self.index_name = index_name
+        self.key = key
+
+    def latest_time(self, partition):
+        pages = query_pages(
+            self.table, Key(self.key).eq(partition), attributes=["Time"],
+            IndexName=self.index_name, ScanIndexForward=False, Limit=1
+        )
+        # Only the first page is read: it holds the item with the highest Time
+        first = next(pages, [])
+        return first[0]["Time"] if first else None
+
+    def items_at(self, partition, time, attributes=None):
+        condition = Key(self.key).eq(partition) & Key("Time").eq(time)
+        return [item for page in query_pages(self.table, condition, attributes, IndexName=self.index_name) for item in page]
+
+    def latest(self, partition, attributes=None):
+        time = self.latest_time(partition)
+        return self.items_at(partition, time, attributes) if time is not None else []
+
+class LocalTimeIndex:
+    """
+    The same lookups over in-memory items, sorted by Time once per partition.
+    partition_of(item) gives an item's partition value (the GSI key it would carry).
+    """
+    def __init__(self, items, partition_of):
+        self._times, self._items = {}, {}
+        groups = {}
+        for item in items:
+            if item.get("Time") is not None:
+                groups.setdefault(partition_of(item), []).append(item)
+        for partition, group in groups.items():
+            group.sort(key=lambda item: str(item["Time"]))
+            self._items[partition] = group
+            self._times[partition] = [str(item["Time"]) for item in group]
+
+    def latest_time(self, partition):
+        times = self._times.get(partition)
+        return times[-1] if times else None
+
+    def items_at(self, partition, time, attributes=None):
+        times = self._times.get(partition, [])
+        start, end = bisect.bisect_left(times, str(time)), bisect.bisect_right(times, str(time))
+        items = self._items.get(partition, [])[start:end]
+        if attributes:
+            items = [{k: item[k] for k in attributes if k in item} for item in items]
+        return items
+
+    def latest(self, partition, attributes=None):
+        time = self.latest_time(partition)
+        return self.items_at(partition, time, attributes) if time is not None else []
@@ -0,0 +1,153 @@
+"""
+Multi-day Smart Radar replay over stored HISTORY#BOOST partitions.
+
+Replays the radar's entry logic (first BROKE entry, max / close move, SmartRank) for every trading day
+in a range and for every combination of entry thresholds, one day per worker process. Closed days are
+read through the on-disk day cache, so re-running over the same months costs no DynamoDB reads.
+
+    python radar_backtest.py --start 2026-07-01 --end 2026-09-30 --oi-min 1 1.5 2 --score-min 15 20 25 --out signals.csv
+
+Prints hit rates per threshold combination; --out writes one row per signal.
+"""
+import os
+import argparse
+import itertools
+import multiprocessing
+from datetime import date, timedelta
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from day_cache import cached_items
+from dynamo_access import get_dynamodb, query_partition
+from item_frames import items_frame, CUMULATIVE_SCORE_SCHEMA
+from radar_engine import RadarState, ENTRY_OI_MIN, ENTRY_SCORE_MIN
+from snapshot_store import SnapshotStore
+
+# --- RADAR REPLAY ---
+
+DYNAMODB_TABLE = os.getenv("DYNAMODB_TABLE", "SentAlerts")
+HIT_MOVE_PCT = 1.0
+RADAR_TOP_N = 20
+
+SIGNAL_COLUMNS = [
+    'Date', 'OI_Min', 'Score_Min', 'Rank', 'Name', 'SmartRank', 'Peak_Score', 'Latest Score',
+    'Signal_Generated_Score', 'Break', 'Staircase', 'Entry Time', 'Entry Price', 'Current Price',
+    'Max Move %', 'Current Move %', 'OI %', 'AI_Decision'
+]
+
+def trading_days(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1) if (start + timedelta(days=i)).weekday() < 5]
+
+def load_day(table_name, target_date):
+    """
+    Raw HISTORY#BOOST items and peak scores for one day, through the day cache.
+    """
+    table = get_dynamodb().Table(table_name)
+    history_pk = f"HISTORY#BOOST#{target_date.isoformat()}"
+    scores_pk = f"CUMULATIVE_SCORE#{target_date.isoformat()}"
+    history = cached_items(table_name, history_pk, target_date, lambda: list(query_partition(table, history_pk)))
+    scores = cached_items(
+        table_name, scores_pk, target_date,
+        lambda: list(query_partition(table, scores_pk, attributes=['SK', 'Best_Score']))
+    )
+
+    scores_df = items_frame(scores, CUMULATIVE_SCORE_SCHEMA)
+    if scores_df.empty or 'Best_Score' not in scores_df.columns:
+        return history, pd.DataFrame(columns=['Name', 'Peak_Score'])
+    scores_df = scores_df.rename(columns={'SK': 'Name', 'Best_Score': 'Peak_Score'})
+    scores_df['Peak_Score'] = scores_df['Peak_Score'].fillna(0)
+    return history, scores_df[['Name', 'Peak_Score']]
+
+def replay_day(target_date, oi_mins, score_mins, table_name=DYNAMODB_TABLE):
+    """
+    End-of-day radar for every threshold combination; one row per stock with a counted entry.
+    The day is decoded once; entry detection runs once per OI threshold, the score gate once per pair.
+    """
+    history, scores = load_day(table_name, target_date)
+    if not history:
+        return pd.DataFrame(columns=SIGNAL_COLUMNS)
+
+    store = SnapshotStore()
+    store.append(history)
+    frame = store.frame()
+
+    results = []
+    for oi_min in oi_mins:
+        state = RadarState(entry_oi_min=oi_min).apply_frame(frame)
+        for score_min in score_mins:
+            state.entry_score_min = score_min
+            radar = state.to_frame(scores)
+            if radar.empty:
+                continue
+            radar = radar.assign(Date=target_date.isoformat(), OI_Min=oi_min, Score_Min=score_min,
+                                 Rank=np.arange(1, len(radar) + 1))
+            results.append(radar[radar['Entry Time'] != '-'])
+    if not results:
+        return pd.DataFrame(columns=SIGNAL_COLUMNS)
+    return pd.concat(results, ignore_index=True)[SIGNAL_COLUMNS]
+
+def replay(start, end, oi_mins=(ENTRY_OI_MIN,), score_mins=(ENTRY_SCORE_MIN,), workers=None, table_name=DYNAMODB_TABLE):
+    """
+    Per-signal results for every trading day in [start, end], one day per worker process.
+    workers=1 replays in this process.
+    """
+    days = trading_days(start, end)
+    if workers == 1 or len(days) <= 1:
+        frames = [replay_day(d, oi_mins, score_mins, table_name) for d in days]
+    else:
+        # spawn: workers start clean instead of inheriting the parent's threads and connections
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            frames = list(pool.map(replay_day, days, itertools.repeat(oi_mins), itertools.repeat(score_mins),
+                                   itertools.repeat(table_name)))
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=SIGNAL_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+def hit_rates(signals, hit_move=HIT_MOVE_PCT, top_n=RADAR_TOP_N):
+    """
+    Aggregates per threshold pair: signal count, hit rate (max move >= hit_move %), close win rate and mean moves.
+    top_n keeps only signals that made the radar's top N by SmartRank (0 = all).
+    """
+    if top_n:
+        signals = signals[signals['Rank'] <= top_n]
+    if signals.empty:
+        return pd.DataFrame()
+    signals = signals.assign(Hit=signals['Max Move %'] >= hit_move, Win=signals['Current Move %'] > 0)
+    stats = signals.groupby(['OI_Min', 'Score_Min']).agg(
+        signals=('Name', 'size'),
+        days=('Date', 'nunique'),
+        hit_rate=('Hit', 'mean'),
+        win_rate=('Win', 'mean'),
+        avg_max_move=('Max Move %', 'mean'),
+        avg_close_move=('Current Move %', 'mean'),
+    ).reset_index()
+    stats[['hit_rate', 'win_rate']] *= 100
+    return stats.sort_values('hit_rate', ascending=False)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=date.fromisoformat, required=True)
+    parser.add_argument("--end", type=date.fromisoformat, required=True)
+    parser.add_argument("--oi-min", type=float, nargs="+", default=[ENTRY_OI_MIN], help="entry |OI change| thresholds")
+    parser.add_argument("--score-min", type=float, nargs="+", default=[ENTRY_SCORE_MIN], help="latest-score gates")
+    parser.add_argument("--hit-move", type=float, default=HIT_MOVE_PCT, help="max move %% that counts as a hit")
+    parser.add_argument("--top", type=int, default=RADAR_TOP_N, help="only count signals in the top N (0 = all)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count; 1 = in-process)")
+    parser.add_argument("--table", default=DYNAMODB_TABLE)
+    parser.add_argument("--out", default=None, help="write per-signal results to this CSV")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    signals = replay(args.start, args.end, tuple(args.oi_min), tuple(args.score_min), args.workers, args.table)
+    if args.out:
+        signals.to_csv(args.out, index=False)
+    stats = hit_rates(signals, args.hit_move, args.top)
+    if stats.empty:
+        print("No signals in range.")
+        return
+    print(stats.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+import pandas as pd
+import numpy as np
+from snapshot_store import SnapshotStore, time_label
+from instrumentation import instrumented
+
+# --- RADAR ENGINE ---
+# Columnar version of the Smart Radar calculations.
+# Every step works on the whole day's snapshot frame at once (group-wise), no per-stock Python loop.
+# Input frames come from the compact SnapshotStore: categorical names/verdicts, int second of day,
+# float32 prices / OI and float64 scores.
+
+AI_VALID_DECISIONS = ['AI_SELECTED', 'FALLBACK_SELECTED']
+ENTRY_SCORE_MIN = 20
+ENTRY_OI_MIN = 1.5
+
+# Staircase: steady OI build-up in small positive steps (fallback when the backend sent '?')
+STAIR_GROWTH_MIN = 2.0
+STAIR_GLITCH_MIN = 1.0
+STAIR_SPIKE_BREAK = 50.0
+STAIR_SPIKE_INSIDE = 5.0
+STAIR_STEP_MIN = -0.5
+STAIR_GOOD_STEP = 0.2
+STAIR_GOOD_STEPS_MIN = 2
+BACKEND_FLAGS = {'TRUE': True, 'YES': True, 'Y': True, 'FALSE': False, 'NO': False, 'N': False}
+
+STAT_COLUMNS = [
+    'Name', 'Latest Score', 'Signal_Generated_Score', 'Break', 'Staircase', 'Entry Time', 'Entry Price',
+    'Current Price', 'Max Move %', 'Current Move %', 'OI %',
+    'AI_Decision', 'AI_Reason', 'AI_Time', 'Option_PCR', 'Option_MaxPain'
+]
+
+LATEST_COLUMNS = ['Second', 'Score', 'BreakType', 'SignalPrice', 'OI_Change', 'Option_PCR', 'Option_MaxPain', 'Staircase']
+ENTRY_COLUMNS = ['Entry Time', 'Entry Price', 'Entry Score', 'Post Max', 'Post Min']
+AI_COLUMNS = ['AI_Decision', 'AI_Reason', 'AI_Time']
+STAIR_COLUMNS = ['OI_Count', 'OI_First', 'OI_Last', 'Last_Nonzero', 'Last_Clean', 'Step_Max', 'Step_Min', 'Good_Steps']
+
+def _category_mask(col, predicate):
+    # Evaluates predicate once per distinct value, then expands it to rows through the codes
+    matches = np.asarray(predicate(pd.Series(col.cat.categories)), dtype=bool)
+    return matches[col.array.codes]
+
+def _by_name(rows):
+    # Per-stock result with a plain string index and no categorical columns
+    rows = rows.set_index('Name')
+    rows.index = rows.index.astype(object)
+    return rows.astype({c: object for c in rows.columns if isinstance(rows[c].dtype, pd.CategoricalDtype)})
+
+def _round_scores(values):
+    # Python's round (exact binary value), not NumPy's scale-and-rint: 52.15 -> 52.1 as in the per-stock loop
+    return np.array([round(float(v), 1) for v in values])
+
+def _upsert(old, new):
+    # Rows in `new` replace rows with the same Name in `old`
+    if old.empty: return new
+    if new.empty: return old
+    return pd.concat([old.drop(new.index, errors='ignore'), new])
+
+class RadarState:
+    """
+    Running per-stock radar aggregates for one day.
+    apply() folds in only new snapshots, so a refresh costs the minute's delta, not the whole session.
+    Snapshots must arrive in SK order (every batch newer than the one before).
+    Entry thresholds default to the live radar's; the replay engine overrides them to tune them.
+    """
+    def __init__(self, entry_oi_min=ENTRY_OI_MIN, entry_score_min=ENTRY_SCORE_MIN):
+        self.entry_oi_min = entry_oi_min
+        self.entry_score_min = entry_score_min
+        self.latest = pd.DataFrame(columns=LATEST_COLUMNS)
+        self.entries = pd.DataFrame(columns=ENTRY_COLUMNS)
+        self.ai = pd.DataFrame(columns=AI_COLUMNS)
+        self.stairs = pd.DataFrame(columns=STAIR_COLUMNS, dtype=float)
+
+    @property
+    def empty(self):
+        return self.latest.empty
+
+    def apply(self, new_snapshots):
+        store = SnapshotStore()
+        store.append(new_snapshots)
+        return self.apply_frame(store.frame())
+
+    @instrumented("process")
+    def apply_frame(self, df):
+        """
+        Folds in a SnapshotStore frame (rows already in SK order).
+        """
+        if df.empty: return self
+        by_name = df.groupby('Name', observed=True, sort=False)
+
+        # 1. Latest snapshot per stock
+        latest = _by_name(by_name.tail(1))[LATEST_COLUMNS]
+
+        # 2. First qualifying entry, kept for the rest of the day once found
+        is_broke = _category_mask(df['BreakType'], lambda c: c.astype(str).str.contains("BROKE"))
+        is_entry = (np.abs(df['OI_Change'].to_numpy()) > self.entry_oi_min) & is_broke
+        first = _by_name(df[is_entry].groupby('Name', observed=True, sort=False).head(1))
+        first = first[['Second', 'SignalPrice', 'Score']].drop(self.entries.index, errors='ignore')
+        first.columns = ['Entry Time', 'Entry Price', 'Entry Score']
+        first = first.assign(**{'Post Max': np.nan, 'Post Min': np.nan})
+        entries = pd.concat([self.entries, first]) if not self.entries.empty else first
+
+        # 3. Running post-entry extremes
+        if not entries.empty:
+            names = df['Name'].cat.categories
+            entry_second = entries['Entry Time'].astype(float).reindex(names).to_numpy()[df['Name'].array.codes]
+            with np.errstate(invalid='ignore'):
+                is_post = df['Second'].to_numpy() >= entry_second
+            post_prices = df[is_post].groupby('Name', observed=True, sort=False)['SignalPrice']
+            post_max, post_min = post_prices.max(), post_prices.min()
+            post_max.index = post_max.index.astype(object)
+            post_min.index = post_min.index.astype(object)
+            entries['Post Max'] = np.fmax(entries['Post Max'].astype(float), post_max.reindex(entries.index).astype(float))
+            entries['Post Min'] = np.fmin(entries['Post Min'].astype(float), post_min.reindex(entries.index).astype(float))
+
+        # 4. Last valid AI verdict
+        is_valid_ai = _category_mask(df['AI_Decision'], lambda c: c.isin(AI_VALID_DECISIONS))
+        ai = _by_name(df[is_valid_ai].groupby('Name', observed=True, sort=False).tail(1))
+        ai = ai[['AI_Decision', 'AI_Reason', 'Second']].rename(columns={'Second': 'AI_Time'})
+
+        self.latest = _upsert(self.latest, latest)
+        self.entries = entries
+        self.ai = _upsert(self.ai, ai)
+        self.stairs = _upsert(self.stairs, self._fold_stairs(df))
+        return self
+
+    def _fold_stairs(self, df):
+        """
+        Running per-stock staircase aggregates over the OI history, in one grouped pass per batch.
+        Glitch fix: a 0 right after a reading above 1% in size repeats the last non-zero reading.
+        """
+        names = df['Name'].cat.categories
+        codes = df['Name'].array.codes
+        # float32 storage -> the reported precision, so step thresholds compare as on the raw values
+        oi = np.round(df['OI_Change'].to_numpy(dtype=float), 4)
+        carry = self.stairs.reindex(names)
+
+        nonzero = pd.Series(np.where(oi != 0, oi, np.nan))
+        last_nonzero = nonzero.groupby(codes).ffill().to_numpy()
+        last_nonzero = np.where(np.isnan(last_nonzero), carry['Last_Nonzero'].fillna(0).to_numpy()[codes], last_nonzero)
+        cleaned = np.where((oi == 0) & (np.abs(last_nonzero) > STAIR_GLITCH_MIN), last_nonzero, oi)
+
+        clean = pd.Series(cleaned)
+        prev_clean = clean.groupby(codes).shift().fillna(pd.Series(carry['Last_Clean'].to_numpy()[codes]))
+        steps = clean - prev_clean
+
+        batch = pd.DataFrame({'oi': oi, 'nonzero': nonzero, 'clean': clean, 'step': steps, 'good': steps > STAIR_GOOD_STEP})
+        batch = batch.groupby(codes).agg(
+            count=('oi', 'size'), first=('oi', 'first'), last=('oi', 'last'), nonzero=('nonzero', 'last'),
+            clean=('clean', 'last'), step_max=('step', 'max'), step_min=('step', 'min'), good=('good', 'sum'),
+        )
+        batch.index = pd.Index(names[batch.index], dtype=object)
+        old = carry.reindex(batch.index)
+
+        return pd.DataFrame({
+            'OI_Count': old['OI_Count'].fillna(0) + batch['count'],
+            'OI_First': old['OI_First'].fillna(batch['first']),
+            'OI_Last': batch['last'],
+            'Last_Nonzero': batch['nonzero'].fillna(old['Last_Nonzero']),
+            'Last_Clean': batch['clean'],
+            'Step_Max': np.fmax(old['Step_Max'], batch['step_max']),
+            'Step_Min': np.fmin(old['Step_Min'], batch['step_min']),
+            'Good_Steps': old['Good_Steps'].fillna(0) + batch['good'],
+        })
+
+    def staircase(self, names, break_types, backend_flags):
+        """
+        Staircase flag per stock: the backend's answer when it gave one, else the local check
+        (growth >= 2%, no step below -0.5, no spike above 50 on PDH/PDL breaks or 5 inside, >= 2 steps above 0.2).
+        """
+        stairs = self.stairs.reindex(names)
+        is_break = break_types.astype(str).str.contains('PDH|PDL').to_numpy()
+        spike_limit = np.where(is_break, STAIR_SPIKE_BREAK, STAIR_SPIKE_INSIDE)
+        local = (
+            (stairs['OI_Count'] >= 2)
+            & (stairs['OI_Last'] - stairs['OI_First'] >= STAIR_GROWTH_MIN)
+            & (stairs['Step_Max'] <= spike_limit)
+            & (stairs['Step_Min'] >= STAIR_STEP_MIN)
+            & (stairs['Good_Steps'] >= STAIR_GOOD_STEPS_MIN)
+        ).to_numpy()
+        backend = backend_flags.astype(str).str.upper().map(BACKEND_FLAGS)
+        return np.where(backend.notna().to_numpy(), backend.to_numpy(), local).astype(bool)
+
+    def to_stats(self):
+        """
+        Per-stock radar stats: latest row, first BROKE entry, post-entry max/min and last valid AI verdict.
+        """
+        if self.empty: return pd.DataFrame()
+
+        latest = self.latest.sort_index()
+        names = latest.index
+
+        # Entries only count while the latest score clears the bar
+        entries = self.entries.reindex(names)
+        has_entry = (entries['Entry Time'].notna() & (latest['Score'] > self.entry_score_min)).values
+        # Prices are stored as float32; back to paise so moves match the raw snapshot values
+        entry_price = entries['Entry Price'].astype(float).round(2)
+        latest_price = latest['SignalPrice'].astype(float).round(2)
+        post_max = entries['Post Max'].astype(float).round(2)
+        post_min = entries['Post Min'].astype(float).round(2)
+        is_bullish = latest['OI_Change'] > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            max_move = np.where(is_bullish, post_max - entry_price, entry_price - post_min) / entry_price * 100
+            curr_move = np.where(is_bullish, latest_price - entry_price, entry_price - latest_price) / entry_price * 100
+
+        ai = self.ai.reindex(names)
+
+        stats = pd.DataFrame({
+            'Name': names,
+            'Latest Score': _round_scores(latest['Score']),
+            'Signal_Generated_Score': np.where(has_entry, _round_scores(entries['Entry Score']), 0),
+            'Break': latest['BreakType'].values,
+            'Staircase': self.staircase(names, latest['BreakType'], latest['Staircase']),
+            'Entry Time': np.where(has_entry, [time_label(t) for t in entries['Entry Time']], '-'),
+            'Entry Price': np.where(has_entry, entry_price, 0),
+            'Current Price': latest_price.values,
+            'Max Move %': np.where(has_entry, max_move, 0),
+            'Current Move %': np.where(has_entry, curr_move, 0),
+            'OI %': latest['OI_Change'].astype(float).values,
+            'AI_Decision': ai['AI_Decision'].fillna('N/A').values,
+            'AI_Reason': ai['AI_Reason'].fillna('-').values,
+            'AI_Time': [time_label(t) for t in ai['AI_Time']],
+            'Option_PCR': latest['Option_PCR'].values,
+            'Option_MaxPain': latest['Option_MaxPain'].values,
+        })
+        return stats[STAT_COLUMNS]
+
+    @instrumented("process")
+    def to_frame(self, cumulative_scores_df):
+        """
+        Ranked Smart Radar frame for the current state.
+        """
+        stats = self.to_stats()
+        if stats.empty: return pd.DataFrame()
+        return rank_radar(stats, cumulative_scores_df)
+
+def rank_radar(radar_df, cumulative_scores_df):
+    """
+    Joins the day's peak scores and computes SmartRank.
+    """
+    if not cumulative_scores_df.empty:
+        radar_df = pd.merge(radar_df, cumulative_scores_df, on="Name", how="left")
+        radar_df['Peak_Score'] = radar_df['Peak_Score'].fillna(0)
+    else:
+        radar_df['Peak_Score'] = 0
+
+    radar_df['Peak_Score'] = radar_df[['Peak_Score', 'Latest Score']].max(axis=1)
+
+    radar_df["SmartRank"] = (
+        0.5 * radar_df['Peak_Score'] +
+        0.3 * radar_df['Latest Score'] +
+        0.2 * radar_df['Signal_Generated_Score']
+    )
+
+    return radar_df.sort_values('SmartRank', ascending=False)
+
+@instrumented("process")
+def process_radar_data(history_items, cumulative_scores_df):
+    """
+    Processes raw history blobs to calculate Metrics & Force-Check Scores.
+    """
+    if not history_items: return pd.DataFrame()
+    return RadarState().apply(history_items).to_frame(cumulative_scores_df)
@@ -0,0 +1,74 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from day_cache import INDIA_TZ
+
+# --- BACKGROUND PREFETCH POLLER ---
+# Runs a task on a fixed schedule during NSE market hours only, independently of page views.
+
+MARKET_OPEN = os.getenv("MARKET_OPEN", "09:15")
+MARKET_CLOSE = os.getenv("MARKET_CLOSE", "15:30")
+POLL_INTERVAL = int(os.getenv("RADAR_POLL_INTERVAL", "30"))
+# Keep polling a little after the close so the final snapshots are picked up
+POLL_GRACE_MINUTES = int(os.getenv("RADAR_POLL_GRACE_MINUTES", "5"))
+
+logger = logging.getLogger(__name__)
+
+def is_market_open(now=None):
+    now = now or datetime.now(INDIA_TZ)
+    if now.weekday() >= 5:
+        return False
+    open_time = datetime.strptime(MARKET_OPEN, "%H:%M").time()
+    close_time = (datetime.strptime(MARKET_CLOSE, "%H:%M") + timedelta(minutes=POLL_GRACE_MINUTES)).time()
+    return open_time <= now.time() <= close_time
+
+class MarketHoursPoller:
+    """
+    Daemon thread calling task() every `interval` seconds while the market is open.
+    The latest result is published as `latest` = (result, fetched_at), fetched_at being the wall time
+    the run started; errors are logged and the next tick runs as normal.
+    """
+    def __init__(self, task, interval=POLL_INTERVAL, name="radar-poller"):
+        self.task = task
+        self.interval = interval
+        self.latest = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def fresh_result(self, max_age=None, fresh_after=0.0):
+        """
+        Latest result if it was fetched within max_age seconds (default: two poll intervals) and not
+        before fresh_after (a session's Refresh time), else None.
+        """
+        latest = self.latest
+        max_age = max_age if max_age is not None else 2 * self.interval
+        if latest is None or time.time() - latest[1] > max_age or latest[1] < fresh_after:
+            return None
+        return latest[0]
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            if is_market_open():
+                try:
+                    fetched_at = time.time()
+                    self.latest = (self.task(), fetched_at)
+                    self.last_error = None
+                except Exception as e:
+                    self.last_error = repr(e)
+                    logger.exception("Radar poll failed")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
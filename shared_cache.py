@@ -0,0 +1,93 @@
+import time
+import threading
+import contextvars
+from concurrent.futures import Future
+from functools import wraps
+import pandas as pd
+
+# --- SHARED LOADER CACHE ---
+# One TTL cache for every viewer of the dashboard process, with single-flight fetches:
+# N sessions asking for the same (loader, args) at the same moment cause exactly one DynamoDB fetch.
+# A session's Refresh only raises that session's FRESH_AFTER, so other viewers keep their cached data.
+
+FRESH_AFTER = contextvars.ContextVar("fresh_after", default=0.0)
+
+class SharedCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}   # key -> (fetched_at, ttl, value)
+        self._inflight = {}  # key -> Future
+
+    def get(self, key, ttl, fetch, fresh_after=0.0):
+        """
+        Cached value for key if younger than ttl and fetched after fresh_after; otherwise fetch it once
+        while any concurrent callers for the same key wait on that fetch.
+        """
+        with self._lock:
+            now = time.time()
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < ttl and entry[0] >= fresh_after:
+                return entry[2]
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+                self._evict_expired(now)
+
+        if not is_owner:
+            return future.result()
+
+        started = time.time()
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[key] = (started, ttl, value)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    def _evict_expired(self, now):
+        for key in [k for k, (fetched_at, ttl, _) in self._entries.items() if now - fetched_at >= ttl]:
+            del self._entries[key]
+
+    def clear(self, prefix=None):
+        with self._lock:
+            if prefix is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[:len(prefix)] == prefix]:
+                    del self._entries[key]
+
+CACHE = SharedCache()
+
+def _copy_value(value):
+    # Every caller gets its own container, so one page's edits never leak into another session
+    if isinstance(value, pd.DataFrame): return value.copy()
+    if isinstance(value, list): return list(value)
+    if isinstance(value, set): return set(value)
+    if isinstance(value, dict): return dict(value)
+    return value
+
+def shared_cached(ttl):
+    """
+    Drop-in for @st.cache_data(ttl=...) backed by the process-wide single-flight cache.
+    """
+    def decorator(fn):
+        prefix = (fn.__module__, fn.__qualname__)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = prefix + (args, tuple(sorted(kwargs.items())))
+            value = CACHE.get(key, ttl, lambda: fn(*args, **kwargs), FRESH_AFTER.get())
+            return _copy_value(value)
+
+        wrapper.clear = lambda: CACHE.clear(prefix)
+        return wrapper
+    return decorator
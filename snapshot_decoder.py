@@ -0,0 +1,56 @@
+import json
+from collections import Counter
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _DECODE_ERRORS = (orjson.JSONDecodeError, ValueError, TypeError)
+except ImportError:
+    _loads = json.loads
+    _DECODE_ERRORS = (ValueError, TypeError)
+
+# --- SNAPSHOT DECODER ---
+# Single decoder for the HISTORY#BOOST `Data` blobs. Each record is decoded once, into the snapshot store.
+
+DECODE_STATS = Counter()
+_SCALARS = (str, int, float)
+
+def decode_blob(raw_data):
+    """
+    Decodes one `Data` payload, unwrapping CSV-style quoting and double-encoded JSON.
+    Raises ValueError if the payload is not a list of stocks.
+    """
+    if isinstance(raw_data, (bytes, bytearray)): raw_data = raw_data.decode()
+    if not isinstance(raw_data, str): raise ValueError(f"unexpected Data type {type(raw_data).__name__}")
+
+    try:
+        try:
+            data = _loads(raw_data)
+        except _DECODE_ERRORS:
+            # CSV-style quoting: "[{""Name"": ...}]"
+            if not raw_data.startswith('"'): raise
+            data = _loads(raw_data[1:-1].replace('""', '"'))
+        if isinstance(data, str): data = _loads(data)
+    except _DECODE_ERRORS as e:
+        raise ValueError(str(e)) from e
+
+    if not isinstance(data, list): raise ValueError(f"expected a list, got {type(data).__name__}")
+    return data
+
+def _is_flat_stock(stock, fields):
+    return isinstance(stock, dict) and all(stock.get(f) is None or isinstance(stock.get(f), _SCALARS) for f in fields)
+
+def decode_snapshot(record, fields=()):
+    """
+    Stocks of one HISTORY#BOOST record. Malformed records are counted in DECODE_STATS and decode to [].
+    A record is malformed if its blob does not decode, or a stock is not a dict with scalar values in `fields`.
+    """
+    try:
+        stocks = decode_blob(record.get('Data'))
+        if not all(_is_flat_stock(stock, fields) for stock in stocks):
+            raise ValueError("stock is not a dict of scalar fields")
+        DECODE_STATS['decoded'] += 1
+    except ValueError:
+        DECODE_STATS['malformed'] += 1
+        stocks = []
+    return stocks
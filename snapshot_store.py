@@ -0,0 +1,177 @@
+import re
+import numpy as np
+import pandas as pd
+from snapshot_decoder import decode_snapshot, DECODE_STATS
+
+# --- COMPACT SNAPSHOT STORE ---
+# One day's HISTORY#BOOST snapshots (one row per stock per minute) as growable NumPy columns:
+# dictionary-encoded names, break types, AI verdicts, reasons, option fields and the backend's staircase flag,
+# int32 second of day, float32 price / OI and float64 score. Frames handed to the radar engine are views over these arrays.
+
+# Scores stay float64: they are rounded to one decimal for display, and a float32 round-trip moves two-decimal
+# scores across the rounding boundary (45.35 -> 45.3)
+NUMERIC_COLUMNS = {'SignalPrice': np.float32, 'OI_Change': np.float32, 'Score': np.float64}
+ENCODED_DEFAULTS = {
+    'Name': None, 'BreakType': 'INSIDE', 'AI_Decision': 'N/A', 'AI_Reason': '',
+    'Option_PCR': '0', 'Option_MaxPain': '0', 'Staircase': '?',
+}
+# Stock fields the store reads; a record with a non-scalar value in any of them is malformed
+STOCK_FIELDS = ['InstrumentKey', 'Best_Score'] + list(NUMERIC_COLUMNS) + list(ENCODED_DEFAULTS)
+
+SK_PATTERN = re.compile(r"([01]\d|2[0-3]):([0-5]\d)(?::([0-5]\d))?")
+
+def second_of_day(sk):
+    """
+    "HH:MM:SS" / "HH:MM" -> seconds since midnight; None for any other SK.
+    """
+    match = SK_PATTERN.fullmatch(sk) if isinstance(sk, str) else None
+    if match is None:
+        return None
+    return int(match[1]) * 3600 + int(match[2]) * 60 + int(match[3] or 0)
+
+def time_label(second):
+    if second is None or second != second or second < 0:
+        return '-'
+    second = int(second)
+    return f"{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}"
+
+def _code_dtype(n_values):
+    # Same code width pandas picks for n categories, so Categorical.from_codes never copies the codes
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_values < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+class _Column:
+    """
+    Growable 1-D array. Appends are amortized O(1); views stay valid after the array grows.
+    """
+    def __init__(self, dtype, capacity=1024):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def append(self, values):
+        needed = self.size + len(values)
+        if needed > len(self.data):
+            grown = np.empty(max(needed, 2 * len(self.data)), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:needed] = values
+        self.size = needed
+
+    def widen(self, dtype):
+        if np.dtype(dtype).itemsize > self.data.dtype.itemsize:
+            self.data = self.data.astype(dtype)
+
+    def view(self, start=0):
+        return self.data[start:self.size]
+
+class _Dictionary:
+    """
+    Dictionary-encoded column: every distinct value is stored once, rows hold integer codes.
+    """
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+        self.column = _Column(np.int8)
+        self._categories = None
+
+    def _encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+            self._categories = None
+        return code
+
+    def encode(self, values):
+        # Codes for a batch of values; new values join the dictionary, rows are only added by append()
+        batch_codes, uniques = pd.factorize(values)
+        mapping = np.fromiter((self._encode(u) for u in uniques), dtype=np.int64, count=len(uniques))
+        return mapping[batch_codes]
+
+    def append(self, codes):
+        self.column.widen(_code_dtype(len(self.values)))
+        self.column.append(codes)
+
+    def categorical(self, start=0):
+        if self._categories is None:
+            self._categories = pd.Index(self.values, dtype=object)
+        return pd.Categorical.from_codes(self.column.view(start), categories=self._categories, validate=False)
+
+class SnapshotStore:
+    """
+    Append-only columnar store of one day's snapshots. Records must be appended in SK order.
+    """
+    def __init__(self):
+        self.second = _Column(np.int32)
+        self.numeric = {c: _Column(dtype) for c, dtype in NUMERIC_COLUMNS.items()}
+        self.encoded = {c: _Dictionary() for c in ENCODED_DEFAULTS}
+        self.instrument_keys = set()
+
+    def __len__(self):
+        return self.second.size
+
+    def append(self, records):
+        """
+        Decodes and appends HISTORY#BOOST records. Returns the index of the first new row.
+        Records whose SK is not a time of day, or whose stocks are not flat dicts, are counted as malformed and skipped.
+        Every column is built before any is appended, so a batch is appended whole or not at all.
+        """
+        start = len(self)
+        stocks, seconds = [], []
+        for record in records:
+            second = second_of_day(record.get('SK'))
+            if second is None:
+                DECODE_STATS['malformed'] += 1
+                continue
+            data = decode_snapshot(record, STOCK_FIELDS)
+            stocks.extend(data)
+            seconds.extend([second] * len(data))
+
+        df = pd.DataFrame(stocks)
+        if df.empty or 'Name' not in df.columns:
+            return start
+        df['Second'] = seconds
+        df = df[df['Name'].notna()]
+        if df.empty:
+            return start
+
+        # Score falls back to Best_Score, then 0
+        score = pd.Series(np.nan, index=df.index)
+        for c in ['Score', 'Best_Score']:
+            if c in df.columns:
+                score = score.fillna(pd.to_numeric(df[c], errors='coerce'))
+        df['Score'] = score
+
+        second = df['Second'].to_numpy(dtype=np.int32)
+        numeric = {}
+        for c, dtype in NUMERIC_COLUMNS.items():
+            values = pd.to_numeric(df[c], errors='coerce').fillna(0) if c in df.columns else 0.0
+            numeric[c] = np.broadcast_to(np.asarray(values, dtype=dtype), len(df))
+        encoded = {}
+        for c, column in self.encoded.items():
+            default = ENCODED_DEFAULTS[c]
+            if c not in df.columns:
+                values = pd.Series(default, index=df.index)
+            else:
+                values = df[c] if default is None else df[c].fillna(default)
+            encoded[c] = column.encode(values.to_numpy(dtype=object))
+        instrument_keys = set(df['InstrumentKey'].dropna()) if 'InstrumentKey' in df.columns else set()
+
+        self.second.append(second)
+        for c, values in numeric.items():
+            self.numeric[c].append(values)
+        for c, codes in encoded.items():
+            self.encoded[c].append(codes)
+        self.instrument_keys.update(instrument_keys)
+        return start
+
+    def frame(self, start=0):
+        """
+        Rows from `start` on as a read-only DataFrame of views over the store (no copy).
+        """
+        columns = {'Name': self.encoded['Name'].categorical(start), 'Second': self.second.view(start)}
+        columns.update({c: column.view(start) for c, column in self.numeric.items()})
+        columns.update({c: column.categorical(start) for c, column in self.encoded.items() if c != 'Name'})
+        return pd.DataFrame(columns, copy=False)
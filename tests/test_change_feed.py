@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from change_feed import ChangeFeed, DynamoDBStreamSource, QueueStreamSource, FEED_APPLY_RETRIES, to_record
+
+ARN = "arn:aws:dynamodb:ap-south-1:000000000000:table/SentAlerts/stream/2024-01-15T00:00:00.000"
+
+class FakeStreams:
+    """
+    One shard holding records 1..n; iterators encode a position, and `expire` makes the next read fail.
+    """
+    def __init__(self, n):
+        self.records = [{"eventName": "INSERT", "dynamodb": {"SequenceNumber": str(i)}} for i in range(1, n + 1)]
+        self.opened = []
+        self.expire = False
+
+    def describe_stream(self, StreamArn, **kwargs):
+        return {"StreamDescription": {"Shards": [{"ShardId": "shard-0"}]}}
+
+    def get_shard_iterator(self, StreamArn, ShardId, ShardIteratorType, SequenceNumber=None):
+        self.opened.append((ShardIteratorType, SequenceNumber))
+        start = {"TRIM_HORIZON": 0, "LATEST": len(self.records), "AFTER_SEQUENCE_NUMBER": int(SequenceNumber or 0)}
+        return {"ShardIterator": f"at-{start[ShardIteratorType]}"}
+
+    def get_records(self, ShardIterator, Limit):
+        if self.expire:
+            self.expire = False
+            raise ClientError({"Error": {"Code": "ExpiredIteratorException", "Message": "expired"}}, "GetRecords")
+        position = int(ShardIterator[3:])
+        batch = self.records[position:position + 2]
+        return {"Records": batch, "NextShardIterator": f"at-{position + len(batch)}"}
+
+def sequence(records):
+    return [r["dynamodb"]["SequenceNumber"] for r in records]
+
+def test_expired_iterator_resumes_after_last_record():
+    client = FakeStreams(0)
+    source = DynamoDBStreamSource(ARN, client)
+    assert source.read() == []
+    client.records = FakeStreams(5).records
+    assert sequence(source.read()) == ["1", "2"]
+
+    client.expire = True
+    assert source.read() == []
+    assert client.opened[-1] == ("AFTER_SEQUENCE_NUMBER", "2")
+    assert sequence(source.read()) == ["3", "4"]
+
+def test_expired_iterator_before_any_record_keeps_its_start():
+    client = FakeStreams(3)
+    source = DynamoDBStreamSource(ARN, client)
+    client.expire = True
+    assert source.read() == []
+    # Opened at LATEST on startup: reopening must not replay the shard from TRIM_HORIZON
+    assert [kind for kind, _ in client.opened] == ["LATEST", "LATEST"]
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+class FlakyApply:
+    """
+    Records what it is handed; raises for the first `failures` calls.
+    """
+    def __init__(self, failures):
+        self.failures = failures
+        self.seen = []
+
+    def __call__(self, items):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("apply failed")
+        self.seen.extend(item["SK"] for item in items)
+        return {("velocity", "2024-01-15")}
+
+def feed_with(apply, *skus):
+    source = QueueStreamSource()
+    for sk in skus:
+        source.records.put(to_record({"PK": "INST#A", "SK": sk}))
+    return ChangeFeed(source, apply, interval=0.01), source
+
+def test_failed_batch_is_applied_with_the_next_read():
+    apply = FlakyApply(failures=2)
+    feed, source = feed_with(apply, "09:15:00", "09:16:00")
+    feed.start()
+    try:
+        assert wait_for(lambda: apply.seen)
+        source.records.put(to_record({"PK": "INST#A", "SK": "09:17:00"}))
+        assert wait_for(lambda: len(apply.seen) == 3)
+    finally:
+        feed.stop()
+    assert apply.seen == ["09:15:00", "09:16:00", "09:17:00"]
+    assert feed.records_seen == 3
+    assert feed.last_error is None
+    assert feed.version("velocity", "2024-01-15") == 2
+
+def test_batch_is_dropped_after_repeated_failures():
+    apply = FlakyApply(failures=FEED_APPLY_RETRIES + 1)
+    feed, source = feed_with(apply, "09:15:00")
+    feed.start()
+    try:
+        assert wait_for(lambda: apply.failures == 0)
+        assert feed.last_error
+        source.records.put(to_record({"PK": "INST#A", "SK": "09:16:00"}))
+        assert wait_for(lambda: apply.seen)
+    finally:
+        feed.stop()
+    assert apply.seen == ["09:16:00"]
+    assert feed.last_error is None
@@ -0,0 +1,95 @@
+import os
+import sys
+import random
+import datetime
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from live_index import DynamoTimeIndex, LocalTimeIndex, live_partition, LIVE_INDEX_KEY
+from synthetic_day import generate_day, create_table, populate, LIVE_TIME_INDEX
+
+# --- LIVE SIGNAL TIME INDEX ---
+# Both indexes must return the slice the Market Velocity page used to take itself:
+# the signal's items, then those at the signal's highest Time.
+
+DAY = datetime.date(2024, 1, 15)
+DATE_STR = DAY.isoformat()
+SIGNALS = ["INTRADAY_BOOST", "SWING_BOOST"]
+
+def live_items(seed=0, stocks=80):
+    """
+    The day's live items, spread over a few ticks and two signals, so the newest tick is a subset.
+    """
+    rnd = random.Random(seed)
+    ticks = ["09:15:00", "10:02:00", "11:47:00", "12:30:00"]
+    items = []
+    for item in generate_day(DAY, stocks=stocks, interval=15, seed=seed):
+        if not item["PK"].startswith("INST#"):
+            continue
+        signal = rnd.choice(SIGNALS)
+        items.append(dict(item, Signal=signal, Time=rnd.choice(ticks), **{LIVE_INDEX_KEY: live_partition(signal, DATE_STR)}))
+    return items
+
+def time_filter(items, signal):
+    # The page's old slice: filter to the signal, then keep its latest Time
+    rows = [item for item in items if item["Signal"] == signal]
+    latest = max(item["Time"] for item in rows) if rows else None
+    return [item for item in rows if item["Time"] == latest]
+
+def keys(items):
+    return sorted(item["PK"] for item in items)
+
+def local_index(items):
+    return LocalTimeIndex(items, lambda item: live_partition(item.get("Signal"), DATE_STR))
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("signal", SIGNALS)
+def test_local_index_matches_time_filter(seed, signal):
+    items = live_items(seed)
+    index = local_index(items)
+    expected = time_filter(items, signal)
+    assert expected
+    assert keys(index.latest(live_partition(signal, DATE_STR))) == keys(expected)
+    assert index.latest_time(live_partition(signal, DATE_STR)) == expected[0]["Time"]
+
+def test_local_index_projects_attributes():
+    items = live_items()
+    sliced = local_index(items).latest(live_partition(SIGNALS[0], DATE_STR), attributes=["PK", "Name", "Time"])
+    assert sliced and all(set(item) == {"PK", "Name", "Time"} for item in sliced)
+
+def test_local_index_unknown_partition():
+    index = local_index(live_items())
+    assert index.latest(live_partition("OTHER", DATE_STR)) == []
+    assert index.latest_time(live_partition("OTHER", DATE_STR)) is None
+
+@pytest.fixture
+def table():
+    moto = pytest.importorskip("moto")
+    boto3 = pytest.importorskip("boto3")
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+        os.environ.setdefault(name, "testing")
+    with moto.mock_aws():
+        yield create_table(boto3.resource("dynamodb", region_name="ap-south-1"), "SentAlerts")
+
+@pytest.mark.parametrize("signal", SIGNALS)
+def test_dynamo_index_matches_time_filter(table, signal):
+    items = live_items(seed=1)
+    populate(table, items)
+    index = DynamoTimeIndex(table, LIVE_TIME_INDEX)
+    partition = live_partition(signal, DATE_STR)
+    expected = time_filter(items, signal)
+    assert index.latest_time(partition) == expected[0]["Time"]
+    assert keys(index.latest(partition)) == keys(expected)
+    assert keys(index.latest(partition)) == keys(local_index(items).latest(partition))
+
+def test_dynamo_index_projects_attributes(table):
+    populate(table, live_items())
+    sliced = DynamoTimeIndex(table, LIVE_TIME_INDEX).latest(live_partition(SIGNALS[0], DATE_STR), attributes=["PK", "Name"])
+    assert sliced and all(set(item) == {"PK", "Name"} for item in sliced)
+
+def test_dynamo_index_empty_partition(table):
+    index = DynamoTimeIndex(table, LIVE_TIME_INDEX)
+    assert index.latest(live_partition("OTHER", DATE_STR)) == []
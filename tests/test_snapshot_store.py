@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot_store import SnapshotStore, second_of_day, time_label
+from snapshot_decoder import DECODE_STATS
+
+def snapshot(sk, stocks):
+    return {"SK": sk, "Data": json.dumps(stocks)}
+
+def stock(name, price, **fields):
+    return dict({"Name": name, "InstrumentKey": f"NSE_FO|{name}", "SignalPrice": price, "OI_Change": 1.0,
+                 "Score": 30.0, "BreakType": "BROKE PDH"}, **fields)
+
+GOOD = [
+    snapshot("09:15:00", [stock("A", 100.0), stock("B", 200.0)]),
+    snapshot("09:16:00", [stock("A", 101.0), stock("B", 201.0)]),
+]
+BAD = [
+    snapshot("09:15:30", [stock("A", 100.5), "foo"]),
+    snapshot("09:15:40", [stock("A", 100.5), [1, 2]]),
+    snapshot("09:15:45", [stock("A", 100.5), None]),
+    snapshot("09:15:50", [stock("A", 100.5, AI_Reason=["a", "b"])]),
+    snapshot("09:15:55", [stock({"x": 1}, 100.5)]),
+    snapshot("9:15", [stock("A", 100.5)]),
+]
+
+def column_sizes(store):
+    sizes = {c: column.column.size for c, column in store.encoded.items()}
+    sizes.update({c: column.size for c, column in store.numeric.items()})
+    sizes['Second'] = store.second.size
+    return sizes
+
+def test_time_of_day():
+    assert second_of_day("09:15") == 33300
+    assert second_of_day("09:15:07") == 33307
+    assert second_of_day("9:15") is None
+    assert time_label(33307) == "09:15:07"
+
+def test_bad_snapshots_are_skipped_whole():
+    before = DECODE_STATS['malformed']
+    store = SnapshotStore()
+    store.append(GOOD[:1])
+    store.append(BAD)
+    store.append(GOOD[1:])
+
+    assert DECODE_STATS['malformed'] - before == len(BAD)
+    assert set(column_sizes(store).values()) == {4}
+    clean = SnapshotStore()
+    clean.append(GOOD)
+    pd.testing.assert_frame_equal(store.frame(), clean.frame())
+
+def test_bad_snapshot_in_a_batch_keeps_the_rest():
+    store = SnapshotStore()
+    start = store.append([GOOD[0]] + BAD + [GOOD[1]])
+    assert start == 0
+    assert set(column_sizes(store).values()) == {4}
+    assert list(store.frame()['SignalPrice']) == [100.0, 200.0, 101.0, 201.0]
+    assert store.instrument_keys == {"NSE_FO|A", "NSE_FO|B"}
@@ -0,0 +1,34 @@
+import os
+import sys
+import pandas as pd
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ticker_index import TickerIndex, normalize_name
+
+CORRECTIONS = {"HINDALCO INDUSTRIES LTD": "HINDALCO"}
+SECTORS = {"HINDALCO": "Metals", "NAM-INDIA": "Finance"}
+
+def test_normalize_name():
+    assert normalize_name("Hindalco  Industries Limited.") == "HINDALCO INDUSTRIES LTD"
+
+def test_variants_of_a_mapped_name_resolve():
+    index = TickerIndex(CORRECTIONS, SECTORS, "NSE")
+    links = index.links(pd.Series(["Hindalco Industries Limited.", "HINDALCO INDUSTRIES LTD"]))
+    assert list(links['TV_Symbol']) == ["NSE:HINDALCO", "NSE:HINDALCO"]
+    assert list(links['Sector']) == ["Metals", "Metals"]
+
+def test_unmapped_names_keep_their_text():
+    # As before the index: the name itself with whitespace removed, punctuation intact
+    index = TickerIndex(CORRECTIONS, SECTORS, "NSE")
+    links = index.links(pd.Series(["NAM-INDIA", "M&M", "Nippon  Life AMC"]))
+    assert list(links['TV_Symbol']) == ["NSE:NAM-INDIA", "NSE:M_M", "NSE:NipponLifeAMC"]
+    assert links['Sector'].iloc[0] == "Finance"
+
+def test_missing_names_get_no_links():
+    index = TickerIndex(CORRECTIONS, SECTORS, "NSE")
+    links = index.links(pd.Series([None, np.nan, "NAM-INDIA"], index=[5, 6, 7]))
+    assert list(links.index) == [5, 6, 7]
+    assert links.loc[[5, 6], ['TV_Symbol', 'Chart']].isna().all().all()
+    assert list(links['Sector']) == ["Others", "Others", "Finance"]
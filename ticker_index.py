@@ -0,0 +1,67 @@
+import re
+import threading
+import pandas as pd
+
+# --- TICKER INDEX ---
+# Display name -> exchange symbol, TradingView symbol, chart URL and sector, resolved once per name.
+# Names are matched on a normalized key (case, punctuation, spacing, LIMITED/LTD), so variants of a
+# mapped name resolve without their own correction entry.
+
+TV_CHART_URL = "https://www.tradingview.com/chart/?symbol="
+LINK_COLUMNS = ['Cleaned_Name', 'TV_Symbol', 'Chart', 'Sector']
+DEFAULT_SECTOR = 'Others'
+
+_PUNCTUATION = re.compile(r"[^A-Z0-9&]+")
+_WHITESPACE = re.compile(r"\s+")
+_SUFFIXES = {'LIMITED': 'LTD', 'L': 'LTD', 'LT': 'LTD'}
+
+def normalize_name(name):
+    """
+    "Hindalco  Industries Limited." -> "HINDALCO INDUSTRIES LTD"
+    """
+    words = _PUNCTUATION.sub(" ", str(name).upper()).split()
+    if len(words) > 1 and words[-1] in _SUFFIXES:
+        words[-1] = _SUFFIXES[words[-1]]
+    return " ".join(words)
+
+class TickerIndex:
+    """
+    Lookup table of resolved names. Names not seen before are resolved and added on first use.
+    """
+    def __init__(self, corrections, sectors, exchange):
+        self.sectors = sectors
+        self.exchange = exchange
+        self._symbols = {normalize_name(s): s for s in set(corrections.values()) | set(sectors)}
+        self._symbols.update({normalize_name(name): s for name, s in corrections.items()})
+        self._lock = threading.Lock()
+        self.table = pd.DataFrame(columns=LINK_COLUMNS, index=pd.Index([], dtype=object))
+        self._add(list(corrections) + list(self._symbols.values()))
+
+    def symbol(self, name):
+        # The normalized key is only for matching: unmapped names keep their own text minus whitespace
+        # ("NAM-INDIA" stays "NAM-INDIA"), as the exchange symbol is usually the name itself
+        return self._symbols.get(normalize_name(name), _WHITESPACE.sub("", str(name)))
+
+    def _add(self, names):
+        symbols = pd.Series([self.symbol(n) for n in names], index=pd.Index(names, dtype=object), dtype=object)
+        tv = self.exchange + ":" + symbols.str.replace("&", "_")
+        rows = pd.DataFrame({
+            'Cleaned_Name': symbols, 'TV_Symbol': tv, 'Chart': TV_CHART_URL + tv,
+            'Sector': symbols.map(self.sectors).fillna(DEFAULT_SECTOR),
+        })
+        self.table = pd.concat([self.table, rows[~rows.index.duplicated()]])
+
+    def links(self, names):
+        """
+        LINK_COLUMNS for each name, aligned to `names` (a Series). Missing names get no links.
+        """
+        keys = names.astype(object)
+        unseen = keys[keys.notna() & ~keys.isin(self.table.index)].unique()
+        if len(unseen):
+            with self._lock:
+                unseen = [n for n in unseen if n not in self.table.index]
+                if unseen:
+                    self._add(unseen)
+        links = self.table.reindex(keys.to_numpy()).set_axis(names.index)
+        links['Sector'] = links['Sector'].fillna(DEFAULT_SECTOR)
+        return links
@@ -1,20 +1,41 @@
 import streamlit as st
 import pandas as pd
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 import os
 import json
-from decimal import Decimal
-from datetime import datetime
-import pytz
+from datetime import datetime, date
 from streamlit_autorefresh import st_autorefresh
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
-import gc
-
-# --- 0. MEMORY CLEANUP ---
-gc.collect()
+import hashlib
+import threading
+import time
+import contextvars
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+try:
+    from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+except ImportError:
+    from streamlit.runtime.scriptrunner.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+from radar_engine import RadarState, AI_VALID_DECISIONS
+from snapshot_store import SnapshotStore
+from dynamo_access import get_dynamodb, batch_get_items, query_pages, query_partition, BATCH_GET_STATS
+from day_cache import cached_items, is_closed_day
+from snapshot_decoder import DECODE_STATS
+import instrumentation
+from instrumentation import instrumented
+import shared_cache
+from shared_cache import shared_cached
+from radar_poller import MarketHoursPoller, INDIA_TZ
+from change_feed import ChangeFeed, open_source
+from ticker_index import TickerIndex
+from live_index import DynamoTimeIndex, LocalTimeIndex, live_partition
+from item_frames import (
+    items_frame, lock_frame, to_float, LIVE_SIGNAL_SCHEMA, CUMULATIVE_SCORE_SCHEMA, SWING_CANDIDATE_SCHEMA, SWING_HISTORY_SCHEMA,
+    LOCK_COLUMNS
+)
 
 # --- 1. PAGE CONFIG ---
 st.set_page_config(page_title="Market Radar", layout="wide", page_icon="📡")
@@ -79,10 +100,27 @@ section[data-testid="stSidebar"] {
 
 
 # --- CONFIG ---
-AWS_REGION = os.getenv("AWS_REGION", "ap-south-1")
 DYNAMODB_TABLE = os.getenv("DYNAMODB_TABLE", "SentAlerts")
 NSE_OI_TABLE = "NSE_OI_DATA"
 DEFAULT_EXCHANGE = "NSE"
+LOADER_TTL = 60
+# Dates whose decoded history stays in memory; closed days evicted past this are rebuilt from the disk cache
+HISTORY_STORE_DATES = int(os.getenv("RADAR_HISTORY_STORE_DATES", "5"))
+RADAR_POLLER_ENABLED = os.getenv("RADAR_POLLER", "0") == "1"
+# DynamoDB Stream ARN or JSONL file path; when set, pages rerun on pushed changes instead of every 60 s
+RADAR_CHANGE_FEED = os.getenv("RADAR_CHANGE_FEED")
+CHANGE_CHECK_SECONDS = float(os.getenv("RADAR_CHANGE_CHECK_SECONDS", "2"))
+# GSI on the live signal items (partition "<Signal>#<date>", sort key Time, projection ALL); when set,
+# Market Velocity reads only the newest tick's items instead of every instrument's
+RADAR_LIVE_TIME_INDEX = os.getenv("RADAR_LIVE_TIME_INDEX")
+
+# Attributes each page reads from the INST#...#LIVE signal items; the loader fetches only these
+VELOCITY_ATTRIBUTES = ('Name', 'Signal', 'SignalPrice', 'BreakType', 'OI_Change', 'Side', 'RankType', 'Time')
+AI_SIGNAL_ATTRIBUTES = (
+    'SK', 'Name', 'InstrumentKey', 'Signal', 'Time', 'Signal_Generated_At', 'AI_Decision', 'AI_Reason',
+    'AI_Confidence', 'Target', 'StopLoss', 'RiskReward', 'Live_Move', 'OI_Change',
+    'Option_PCR', 'Option_MaxPain', 'Option_Res', 'Option_Sup'
+)
 
 # === TRADINGVIEW MAPPING ===
 TICKER_CORRECTIONS = {
@@ -230,262 +268,207 @@ SECTOR_MAP = {
     "ADANIENT": "Diversified", "ADANIPORTS": "Infra"
 }
 
-# --- HELPER FUNCTIONS ---
-def convert_decimal(obj):
-    if isinstance(obj, list): return [convert_decimal(i) for i in obj]
-    elif isinstance(obj, dict): return {k: convert_decimal(v) for k, v in obj.items()}
-    elif isinstance(obj, Decimal): return float(obj)
-    return obj
+@st.cache_resource
+def get_ticker_index():
+    # Built once per process; names missing from TICKER_CORRECTIONS are resolved and cached on first sight
+    return TickerIndex(TICKER_CORRECTIONS, SECTOR_MAP, DEFAULT_EXCHANGE)
 
 # --- 1. OPTIMIZED DATA LOADING ---
-@st.cache_data(ttl=60)
+class HistoryStore:
+    """
+    Per-date store of HISTORY#BOOST snapshots, held in a compact columnar SnapshotStore.
+    Remembers the highest SK already seen so each refresh only queries newer snapshots,
+    and folds those snapshots into the day's incremental radar state.
+    """
+    def __init__(self, target_date):
+        self.target_date = target_date
+        self.pk = f"HISTORY#BOOST#{target_date.isoformat()}"
+        self.snapshots = SnapshotStore()
+        self.last_sk = None
+        self.complete = False
+        self.refreshed_at = 0.0
+        self.radar = RadarState()
+        self.lock = threading.Lock()
+
+    def fetch_new(self, table, prefetch=False, keep=False):
+        """
+        Queries the snapshots newer than last_sk and appends each page as it arrives, so decoding overlaps
+        the remaining pages' transfer when prefetch is on. Returns the raw items if keep, else their count.
+        """
+        condition = Key('PK').eq(self.pk)
+        if self.last_sk is not None:
+            condition = condition & Key('SK').gt(self.last_sk)
+        kept, count = [], 0
+        for page in query_pages(table, condition, prefetch=prefetch):
+            if page:
+                self._append(page)
+                count += len(page)
+                if keep: kept.extend(page)
+        return kept if keep else count
+
+    def refresh(self, table):
+        # At most one delta query per LOADER_TTL per date, shared by every session and loader, unless this
+        # session's Refresh (FRESH_AFTER) is newer than the last query. One refresh runs at a time; callers
+        # queued behind it reuse its result (single-flight).
+        fresh_after = shared_cache.FRESH_AFTER.get()
+        with self.lock:
+            if self.complete or (self.refreshed_at >= fresh_after and time.time() - self.refreshed_at < LOADER_TTL):
+                return self.snapshots
+            previous, self.refreshed_at = self.refreshed_at, time.time()
+
+            try:
+                # Cold loads read the whole partition: the next page is requested while this one decodes
+                closed = is_closed_day(self.target_date)
+                if closed and self.last_sk is None:
+                    # Closed days come from the disk cache and are never queried again
+                    items = cached_items(table.name, self.pk, self.target_date, lambda: self.fetch_new(table, prefetch=True, keep=True))
+                    if items and self.last_sk is None:
+                        # Read from disk: fetch_new did not run, so nothing was appended yet
+                        self._append(items)
+                else:
+                    self.fetch_new(table, prefetch=self.last_sk is None)
+            except Exception:
+                # A failed query is retried by the next caller rather than after the TTL
+                self.refreshed_at = previous
+                raise
+            self.complete = closed and self.last_sk is not None
+            return self.snapshots
+
+    def _append(self, new_items):
+        # Raw items are dropped once decoded; only the compact columns and the radar state are kept
+        start = self.snapshots.append(new_items)
+        self.last_sk = max(item['SK'] for item in new_items)
+        self.radar.apply_frame(self.snapshots.frame(start))
+
+    def apply_stream(self, stream_items):
+        """
+        Folds snapshots pushed by the change feed into the store. Returns True if any were new.
+        A store that was never loaded ignores them: its first refresh queries the whole partition anyway.
+        """
+        with self.lock:
+            if self.last_sk is None:
+                return False
+            new_items = sorted((i for i in stream_items if i['SK'] > self.last_sk), key=lambda i: i['SK'])
+            if not new_items:
+                return False
+            self._append(new_items)
+            return True
+
+    def radar_frame(self, cumulative_scores_df):
+        with self.lock:
+            return self.radar.to_frame(cumulative_scores_df)
+
+@st.cache_resource(max_entries=HISTORY_STORE_DATES)
+def get_history_store(target_date):
+    return HistoryStore(target_date)
+
+@instrumented("load")
 def load_todays_history_optimized(target_date):
     """
-    Fetches the entire day's history in one go via Query (Fast).
+    Returns the day's SnapshotStore, fetching only snapshots newer than the last seen SK.
     """
+    store = get_history_store(target_date)
     try:
-        dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+        dynamodb = get_dynamodb()
         table = dynamodb.Table(DYNAMODB_TABLE)
-        pk = f"HISTORY#BOOST#{target_date.isoformat()}"
-        
-        response = table.query(KeyConditionExpression=Key('PK').eq(pk))
-        items = response.get('Items', [])
-        
-        while 'LastEvaluatedKey' in response:
-            response = table.query(
-                KeyConditionExpression=Key('PK').eq(pk),
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            items.extend(response.get('Items', []))
-        return items
+        return store.refresh(table)
     except Exception as e:
         st.error(f"Error fetching history: {e}")
-        return []
+        return store.snapshots
 
-def calculate_staircase_locally(history_ois, break_type):
-    """
-    FAIL-SAFE: Logic to check Staircase if backend returned '?'
-    Allows Spikes if 'BreakType' indicates a breakout.
-    """
-    if len(history_ois) < 2: return False
-    
-    # Growth Check (> 2%)
-    if (history_ois[-1] - history_ois[0]) < 2.0: return False
-    
-    # Glitch Fix
-    cleaned = []
-    last_val = 0
-    for v in history_ois:
-        if v == 0 and abs(last_val) > 1.0: cleaned.append(last_val)
-        else: 
-            cleaned.append(v)
-            last_val = v
-            
-    steps = np.diff(cleaned)
-    if len(steps) == 0: return False
-    
-    # Spike Filter Logic
-    is_break = ("PDH" in str(break_type)) or ("PDL" in str(break_type))
-    
-    # If Breaking: Allow huge steps. If Inside: Restrict steps.
-    spike_limit = 50.0 if is_break else 5.0
-    
-    if max(steps) > spike_limit: return False
-    if min(steps) < -0.5: return False
-    
-    # Consistency
-    good_steps = [s for s in steps if s > 0.2]
-    return len(good_steps) >= 2
+def fetch_live_signal_items(dynamodb, target_date, attributes=None):
+    date_str = target_date.isoformat()
 
-def process_radar_data(history_items, cumulative_scores_df):
-    """
-    Processes raw history blobs to calculate Metrics & Force-Check Scores.
-    """
-    if not history_items: return pd.DataFrame()
-    
-    # 1. Flatten all snapshots
-    all_snapshots = []
-    for record in history_items:
-        time_str = record.get('SK')
-        try:
-            raw_data = record.get('Data')
-            if isinstance(raw_data, str):
-                if raw_data.startswith('"'): raw_data = raw_data[1:-1].replace('""', '"')
-                data = json.loads(raw_data)
-                if isinstance(data, str): data = json.loads(data)
-                
-                if isinstance(data, list):
-                    for stock in data:
-                        stock['SnapshotTime'] = time_str
-                        stock['SignalPrice'] = float(stock.get('SignalPrice', 0))
-                        stock['OI_Change'] = float(stock.get('OI_Change', 0))
-                        
-                        # --- NEW: Extract AI Fields ---
-                        stock['AI_Decision'] = stock.get('AI_Decision', 'N/A')
-                        stock['AI_Reason'] = stock.get('AI_Reason', '')
-                        stock['Option_PCR'] = stock.get('Option_PCR', '0')
-                        stock['Option_MaxPain'] = stock.get('Option_MaxPain', '0')
-                        
-                        all_snapshots.append(stock)
-        except: continue
-            
-    df_full = pd.DataFrame(all_snapshots)
-    if df_full.empty: return pd.DataFrame()
-    
-    # 2. Group by Stock
-    stats = []
-    for stock_name, group in df_full.groupby('Name'):
-        group = group.sort_values('SnapshotTime')
-        latest = group.iloc[-1]
-        latest_score = float(latest.get("Score", latest.get("Best_Score", 0)))
-        break_type = str(latest.get('BreakType', 'INSIDE')).upper()
-        
-        signal_gen_score = 0
-        
-        # 3. Entry Logic
-        if latest_score > 20:
-            potential_entries = group[(group['OI_Change'].abs() > 1.5) & (group['BreakType'].astype(str).str.contains("BROKE", na=False))]
-            
-            if not potential_entries.empty:
-                first_entry = potential_entries.iloc[0]
-                entry_price = float(first_entry['SignalPrice'])
-                entry_time = first_entry['SnapshotTime']
-                signal_gen_score = float(first_entry.get("Score", first_entry.get("Best_Score", 0)))
-                
-                # Calculate Moves
-                is_bullish = latest['OI_Change'] > 0
-                post_entry = group[group['SnapshotTime'] >= entry_time]
-                
-                if is_bullish:
-                    max_price = post_entry['SignalPrice'].max()
-                    max_move = ((max_price - entry_price) / entry_price) * 100
-                    curr_move = ((latest['SignalPrice'] - entry_price) / entry_price) * 100
-                else:
-                    min_price = post_entry['SignalPrice'].min()
-                    max_move = ((entry_price - min_price) / entry_price) * 100
-                    curr_move = ((entry_price - latest['SignalPrice']) / entry_price) * 100
-            else:
-                entry_time, entry_price, max_move, curr_move = "-", 0, 0, 0
-        else:
-             entry_time, entry_price, max_move, curr_move = "-", 0, 0, 0
+    # Step 1: Get instrument keys from the day's history store (delta query only; snapshots decoded once)
+    store = get_history_store(target_date)
+    store.refresh(dynamodb.Table(DYNAMODB_TABLE))
+    instrument_keys = set(store.snapshots.instrument_keys)
 
-        # --- FIX: LOOK FOR LAST VALID AI VERDICT ---
-        # Instead of just checking 'latest', we look for the last row where AI_Decision is NOT N/A
-        valid_ai_rows = group[group['AI_Decision'].isin(['AI_SELECTED', 'FALLBACK_SELECTED'])]
-        
-        if not valid_ai_rows.empty:
-            last_valid_ai = valid_ai_rows.iloc[-1]
-            ai_decision = last_valid_ai['AI_Decision']
-            ai_reason = last_valid_ai['AI_Reason']
-            ai_time = last_valid_ai['SnapshotTime'] # Capture Time
-        else:
-            ai_decision = "N/A"
-            ai_reason = "-"
-            ai_time = "-"
-
-        stats.append({
-            'Name': stock_name,
-            'Latest Score': round(latest_score, 1),
-            'Signal_Generated_Score': round(signal_gen_score, 1),
-            'Break': latest.get('BreakType', 'INSIDE'),
-            'Entry Time': entry_time,
-            'Entry Price': entry_price,
-            'Current Price': latest['SignalPrice'],
-            'Max Move %': max_move,
-            'Current Move %': curr_move,
-            'OI %': latest['OI_Change'],
-            # --- PERSISTENT AI Fields ---
-            'AI_Decision': ai_decision,
-            'AI_Reason': ai_reason,
-            'AI_Time': ai_time,
-            'Option_PCR': latest.get('Option_PCR', '-'),
-            'Option_MaxPain': latest.get('Option_MaxPain', '-')
-        })
-    
-    if not stats:
-        return pd.DataFrame()
+    # Step 2: Batched, parallel BatchGetItem for all instruments (NO SCAN)
+    keys = [
+        {"PK": f"INST#{key}#{date_str}", "SK": "SIGNAL#INTRADAY_BOOST#LIVE"}
+        for key in sorted(instrument_keys)
+    ]
+    return batch_get_items(dynamodb, DYNAMODB_TABLE, keys, attributes)
 
-    radar_df = pd.DataFrame(stats)
+def _attributes_suffix(attributes):
+    # Each projection is cached under its own key
+    return "#" + hashlib.md5(",".join(attributes).encode()).hexdigest()[:8] if attributes else ""
 
-    if not cumulative_scores_df.empty:
-        radar_df = pd.merge(radar_df, cumulative_scores_df, on="Name", how="left")
-        radar_df['Peak_Score'] = radar_df['Peak_Score'].fillna(0)
-    else:
-        radar_df['Peak_Score'] = 0
-
-    radar_df['Peak_Score'] = radar_df[['Peak_Score', 'Latest Score']].max(axis=1)
-
-    radar_df["SmartRank"] = (
-        0.5 * radar_df['Peak_Score'] +
-        0.3 * radar_df['Latest Score'] +
-        0.2 * radar_df['Signal_Generated_Score']
+def live_signal_items(dynamodb, target_date, attributes=None):
+    """
+    Raw live signal items for the day, through the day cache.
+    """
+    cache_key = f"INST#{target_date.isoformat()}#SIGNAL#INTRADAY_BOOST#LIVE" + _attributes_suffix(attributes)
+    items = cached_items(
+        DYNAMODB_TABLE, cache_key, target_date,
+        lambda: fetch_live_signal_items(dynamodb, target_date, attributes)
     )
-    
-    return radar_df.sort_values('SmartRank', ascending=False)
-
-@st.cache_data(ttl=60)
-def load_data_from_dynamodb(target_date, signal_type=None):
-    try:
-        dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
-        table = dynamodb.Table(DYNAMODB_TABLE)
-        date_str = target_date.isoformat()
-
-        # Step 1: Get instrument keys from history (FAST partition query)
-        history_pk = f"HISTORY#BOOST#{date_str}"
-        history_response = table.query(
-            KeyConditionExpression=Key('PK').eq(history_pk)
-        )
-        history_items = history_response.get("Items", [])
-
-        instrument_keys = set()
-
-        for record in history_items:
-            try:
-                raw = json.loads(record.get("Data", "[]"))
-                if isinstance(raw, str):
-                    raw = json.loads(raw)
-                for item in raw:
-                    if "InstrumentKey" in item:
-                        instrument_keys.add(item["InstrumentKey"])
-            except:
-                continue
-
-        # Step 2: Direct get_item for each instrument (NO SCAN)
-        items = []
-        for key in instrument_keys:
-            pk = f"INST#{key}#{date_str}"
-            sk = "SIGNAL#INTRADAY_BOOST#LIVE"
-
-            try:
-                resp = table.get_item(Key={"PK": pk, "SK": sk})
-                if "Item" in resp:
-                    items.append(convert_decimal(resp["Item"]))
-            except:
-                continue
+    missing = getattr(items, 'missing', None)
+    if missing:
+        st.warning(f"{len(missing)} live signals could not be read (throttled or failed) and are missing from this view.")
+    return items
 
-        if not items:
-            return pd.DataFrame()
-
-        df = pd.DataFrame(items)
+def live_signal_frame(items, signal_type=None):
+    df = items_frame(items, LIVE_SIGNAL_SCHEMA)
+    if df.empty:
+        return df
 
-        if signal_type and 'Signal' in df.columns:
-            df = df[df['Signal'] == signal_type].copy()
+    if signal_type and 'Signal' in df.columns:
+        df = df[df['Signal'] == signal_type].copy()
 
-        numeric = ['SignalPrice', 'OI_Change']
-        for c in numeric:
-            if c in df.columns:
-                df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0)
+    numeric = ['SignalPrice', 'OI_Change']
+    for c in numeric:
+        if c in df.columns:
+            df[c] = df[c].fillna(0)
 
-        return df
+    return df
 
+@instrumented("load")
+@shared_cached(ttl=LOADER_TTL)
+def load_data_from_dynamodb(target_date, signal_type=None, attributes=None):
+    """
+    Live signal items as a frame. attributes (a page's *_ATTRIBUTES tuple) fetches only those columns,
+    and each projection is cached as its own slim frame.
+    """
+    try:
+        return live_signal_frame(live_signal_items(get_dynamodb(), target_date, attributes), signal_type)
     except Exception as e:
         st.error(f"DynamoDB optimized fetch error: {e}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@instrumented("load")
+@shared_cached(ttl=LOADER_TTL)
+def load_latest_live_slice(target_date, signal_type, attributes=None):
+    """
+    Live signal items of the newest tick only, as a frame. With RADAR_LIVE_TIME_INDEX the tick is read
+    straight from the Time index; otherwise the day's live items are indexed by Time locally and sliced.
+    Only the GSI path reads less: without it every live item is still fetched, as before.
+    """
+    try:
+        dynamodb = get_dynamodb()
+        date_str = target_date.isoformat()
+        partition = live_partition(signal_type, date_str)
+        if RADAR_LIVE_TIME_INDEX:
+            index = DynamoTimeIndex(dynamodb.Table(DYNAMODB_TABLE), RADAR_LIVE_TIME_INDEX)
+            cache_key = f"LIVE_TIME#{partition}" + _attributes_suffix(attributes)
+            items = cached_items(DYNAMODB_TABLE, cache_key, target_date, lambda: index.latest(partition, attributes))
+        else:
+            index = LocalTimeIndex(
+                live_signal_items(dynamodb, target_date, attributes),
+                lambda item: live_partition(item.get('Signal'), date_str)
+            )
+            items = index.latest(partition)
+        return live_signal_frame(items, signal_type)
+    except Exception as e:
+        st.error(f"DynamoDB latest-tick fetch error: {e}")
+        return pd.DataFrame()
+
+@instrumented("load")
+@shared_cached(ttl=LOADER_TTL)
 def load_nse_sector_data():
     try:
-        dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+        dynamodb = get_dynamodb()
         table = dynamodb.Table(NSE_OI_TABLE) 
         response = table.get_item(Key={"PK": "NSE#OI", "SK": "LATEST"})
         if "Item" in response:
@@ -493,62 +476,69 @@ def load_nse_sector_data():
     except: pass
     return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@instrumented("load")
+@shared_cached(ttl=LOADER_TTL)
 def load_lock_data(target_date):
+    """
+    The day's locked stocks as a frame indexed by Stock, shared by Smart Radar and AI SIGNAL.
+    """
     try:
-        dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+        dynamodb = get_dynamodb()
         table = dynamodb.Table(DYNAMODB_TABLE)
         pk = f"DAILY_UNIQUE_LOCK#{target_date.isoformat()}"
-        response = table.query(KeyConditionExpression=Key('PK').eq(pk))
-        return response.get("Items", [])
+        return lock_frame(cached_items(DYNAMODB_TABLE, pk, target_date, lambda: list(query_partition(table, pk))))
     except:
-        return []
+        return lock_frame([])
+
+def join_locks(df, locks, on):
+    """
+    Adds Locked, Lock Time and Reentry to df in one join on the `on` column.
+    """
+    df = df.join(locks, on=on)
+    df["Locked"] = np.where(df["Lock Time"].notna(), "🔒", "")
+    df[LOCK_COLUMNS] = df[LOCK_COLUMNS].fillna("-")
+    return df
 
-@st.cache_data(ttl=60)
+@instrumented("load")
+@shared_cached(ttl=LOADER_TTL)
 def load_daily_ai_registry(target_date):
     """
     Fetches the persistent daily AI selection list.
     This helps recover signals that may have been overwritten in the live table.
     """
     try:
-        dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+        dynamodb = get_dynamodb()
         table = dynamodb.Table(DYNAMODB_TABLE)
         pk = f"AI_DAILY_ALERT#{target_date.isoformat()}"
-        response = table.query(KeyConditionExpression=Key('PK').eq(pk))
-        return {item['SK'] for item in response.get('Items', [])}
+        items = cached_items(DYNAMODB_TABLE, pk, target_date, lambda: list(query_partition(table, pk, attributes=['SK'])))
+        return {item['SK'] for item in items}
     except:
         return set()
 
-@st.cache_data(ttl=60)
+@instrumented("load")
+@shared_cached(ttl=LOADER_TTL)
 def load_cumulative_scores(target_date):
     """
     Fetches the cumulative best scores for all stocks for a given day.
     """
     try:
-        dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+        dynamodb = get_dynamodb()
         table = dynamodb.Table(DYNAMODB_TABLE)
         pk = f"CUMULATIVE_SCORE#{target_date.isoformat()}"
-        response = table.query(KeyConditionExpression=Key('PK').eq(pk))
-        items = response.get("Items", [])
-        
-        while 'LastEvaluatedKey' in response:
-            response = table.query(
-                KeyConditionExpression=Key('PK').eq(pk),
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            items.extend(response.get('Items', []))
 
-        if not items:
-            return pd.DataFrame(columns=['Name', 'Peak_Score'])
-        
-        df = pd.DataFrame(convert_decimal(items))
+        items = cached_items(
+            DYNAMODB_TABLE, pk, target_date,
+            lambda: list(query_partition(table, pk, attributes=['SK', 'Best_Score']))
+        )
+
+        df = items_frame(items, CUMULATIVE_SCORE_SCHEMA)
         if df.empty:
             return pd.DataFrame(columns=['Name', 'Peak_Score'])
         
         df = df.rename(columns={'SK': 'Name', 'Best_Score': 'Peak_Score'})
         
         if 'Peak_Score' in df.columns:
-            df['Peak_Score'] = pd.to_numeric(df['Peak_Score'], errors='coerce').fillna(0)
+            df['Peak_Score'] = df['Peak_Score'].fillna(0)
         
         return df[['Name', 'Peak_Score']]
         
@@ -556,18 +546,229 @@ def load_cumulative_scores(target_date):
         st.error(f"Error loading cumulative scores: {e}")
         return pd.DataFrame(columns=['Name', 'Peak_Score'])
 
-@st.cache_data(ttl=60)
+@instrumented("load")
+@shared_cached(ttl=LOADER_TTL)
 def load_swing_candidates(selected_date):
     try:
-        dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+        dynamodb = get_dynamodb()
         table = dynamodb.Table(DYNAMODB_TABLE)
 
-        response = table.query(
-            KeyConditionExpression=Key('PK').eq("SWING_ACTIVE")
-        )
-        return response.get("Items", [])
+        return items_frame(list(query_partition(table, "SWING_ACTIVE")), SWING_CANDIDATE_SCHEMA)
     except:
-        return []
+        return pd.DataFrame()
+
+# --- 2. PAGE DATA LOADER ---
+PAGE_LOADER_WORKERS = 8
+
+@st.cache_resource
+def get_page_loader_pool():
+    return ThreadPoolExecutor(max_workers=PAGE_LOADER_WORKERS, thread_name_prefix="page-loader")
+
+def _set_thread_ctx(thread, ctx):
+    # add_script_run_ctx ignores None, so detaching sets the attribute it reads directly
+    if ctx is None:
+        setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+    else:
+        add_script_run_ctx(thread, ctx)
+
+def _run_with_ctx(ctx, fn, *args):
+    # Binds the calling session (none for poller runs) to the pool thread for this task only, so a loader's
+    # st.error reaches that session and never the session that used the thread before
+    thread = threading.current_thread()
+    saved = get_script_run_ctx(suppress_warning=True)
+    _set_thread_ctx(thread, ctx)
+    try:
+        return fn(*args)
+    finally:
+        _set_thread_ctx(thread, saved)
+
+def fetch_concurrently(calls):
+    """
+    Runs independent loaders in parallel: {name: (loader, *args)} -> {name: result}.
+    Page latency becomes the slowest query instead of the sum of all of them.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    pool = get_page_loader_pool()
+    # Each task runs in a copy of the session's context (carries its refresh time and metrics span)
+    futures = {
+        name: pool.submit(contextvars.copy_context().run, _run_with_ctx, ctx, *call)
+        for name, call in calls.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+@dataclass
+class RadarPageData:
+    radar: pd.DataFrame
+    cumulative_scores: pd.DataFrame
+    locks: pd.DataFrame
+
+@dataclass
+class AIPageData:
+    registry: set
+    signals: pd.DataFrame
+    locks: pd.DataFrame
+
+def fetch_radar_page(target_date):
+    """
+    Smart Radar inputs, fetched concurrently. The radar frame comes from the day's incremental radar state.
+    """
+    data = fetch_concurrently({
+        "history": (load_todays_history_optimized, target_date),
+        "scores": (load_cumulative_scores, target_date),
+        "locks": (load_lock_data, target_date),
+    })
+    radar_df = get_history_store(target_date).radar_frame(data["scores"])
+    return RadarPageData(radar=radar_df, cumulative_scores=data["scores"], locks=data["locks"])
+
+def prefetch_radar_page():
+    """
+    Poller task: refreshes today's HISTORY#BOOST, CUMULATIVE_SCORE and DAILY_UNIQUE_LOCK partitions
+    and returns the precomputed radar page for today.
+    """
+    today = datetime.now(INDIA_TZ).date()
+    token = shared_cache.FRESH_AFTER.set(time.time())
+    try:
+        return today, fetch_radar_page(today)
+    finally:
+        shared_cache.FRESH_AFTER.reset(token)
+
+@st.cache_resource
+def get_radar_poller():
+    if not RADAR_POLLER_ENABLED:
+        return None
+    return MarketHoursPoller(prefetch_radar_page).start()
+
+def load_radar_page(target_date):
+    """
+    Ready snapshot from the background poller when it has a fresh one for this date, else a direct fetch.
+    """
+    poller = get_radar_poller()
+    # With the change feed on, the history store is newer than any poller snapshot.
+    # A snapshot fetched before this session's Refresh is skipped, as the shared cache skips its entries.
+    published = poller.fresh_result(fresh_after=shared_cache.FRESH_AFTER.get()) if poller and not get_change_feed() else None
+    if published and published[0] == target_date:
+        data = published[1]
+        return RadarPageData(radar=data.radar.copy(), cumulative_scores=data.cumulative_scores, locks=data.locks)
+    return fetch_radar_page(target_date)
+
+def load_ai_page(target_date):
+    """
+    AI SIGNAL inputs, fetched concurrently.
+    """
+    data = fetch_concurrently({
+        "registry": (load_daily_ai_registry, target_date),
+        "signals": (load_data_from_dynamodb, target_date, None, AI_SIGNAL_ATTRIBUTES),
+        "locks": (load_lock_data, target_date),
+    })
+    return AIPageData(registry=data["registry"], signals=data["signals"], locks=data["locks"])
+
+# --- 3. LIVE UPDATES ---
+def apply_changes(items):
+    """
+    Change-feed handler: folds new writes into the in-memory state and returns the (view, date) pairs they change.
+    "radar" is Smart Radar, "signals" the AI SIGNAL page.
+    """
+    changed, stale, history, registries = set(), set(), {}, {}
+    for item in items:
+        prefix, _, date_str = str(item.get("PK", "")).rpartition("#")
+        try:
+            target_date = date.fromisoformat(date_str)
+        except ValueError:
+            continue
+
+        if prefix == "HISTORY#BOOST":
+            history.setdefault(target_date, []).append(item)
+        elif prefix.startswith("INST#") and item.get("SK") == "SIGNAL#INTRADAY_BOOST#LIVE":
+            # Every instrument's live item is rewritten each tick; only those the AI SIGNAL page shows
+            # (selected now, or earlier today per the registry) change it. Others wait for the loader TTL.
+            if target_date not in registries:
+                registries[target_date] = load_daily_ai_registry(target_date)
+            if item.get("AI_Decision") in AI_VALID_DECISIONS or item.get("Name") in registries[target_date]:
+                stale.update({load_data_from_dynamodb, load_latest_live_slice})
+                changed.add(("signals", target_date))
+        elif prefix == "AI_DAILY_ALERT":
+            stale.add(load_daily_ai_registry)
+            changed.add(("signals", target_date))
+        elif prefix == "CUMULATIVE_SCORE":
+            stale.add(load_cumulative_scores)
+            changed.add(("radar", target_date))
+        elif prefix == "DAILY_UNIQUE_LOCK":
+            stale.add(load_lock_data)
+            changed.update({("radar", target_date), ("signals", target_date)})
+
+    # Snapshots update the radar state in place; other partitions are refetched on the next rerun
+    for target_date, snapshots in history.items():
+        if get_history_store(target_date).apply_stream(snapshots):
+            changed.add(("radar", target_date))
+    for loader in stale:
+        loader.clear()
+    return changed
+
+@st.cache_resource
+def get_change_feed():
+    if not RADAR_CHANGE_FEED:
+        return None
+    return ChangeFeed(open_source(RADAR_CHANGE_FEED), apply_changes).start()
+
+def _feed_failing(feed):
+    return feed.last_error is not None or not feed.running
+
+@st.fragment(run_every=CHANGE_CHECK_SECONDS)
+def _watch_changes(view, target_date, seen):
+    # Runs on its own every few seconds; only a change to this session's (view, date) reruns the page,
+    # or the feed failing, so the page falls back to timed reruns
+    feed = get_change_feed()
+    if feed.version(view, target_date) != seen or _feed_failing(feed):
+        st.rerun()
+
+def follow_changes(view, target_date, key):
+    """
+    Reruns the page when what it shows changes: on change-feed pushes when the feed is on and healthy,
+    else every 60 s.
+    """
+    feed = get_change_feed()
+    if feed is None or _feed_failing(feed):
+        st_autorefresh(interval=60 * 1000, key=key)
+        return
+    # Version read before loading, so a change landing mid-render still triggers a rerun
+    _watch_changes(view, target_date, feed.version(view, target_date))
+
+# --- 4. RENDER MEMO ---
+def render_memo(name, rows, build):
+    """
+    This session's last build(rows) for element `name`, rebuilt only when a row differs from the rows it was built from.
+    A reused table or card is re-emitted byte-identical, so Streamlit keeps its element id and the browser keeps what it drew.
+    Recorded as a "render" span (hit = reused, items = rows changed).
+    """
+    start = time.perf_counter()
+    hashes = pd.util.hash_pandas_object(rows, index=False).to_numpy()
+    memo = st.session_state.setdefault("render_memo", {})
+    last = memo.get(name)
+    changed = int((last[0] != hashes).sum()) if last is not None and len(last[0]) == len(hashes) else len(hashes)
+    reused = last is not None and changed == 0
+    if reused:
+        output = last[1]
+    else:
+        output = build(rows)
+        memo[name] = (hashes, output)
+    instrumentation.record({
+        "kind": "render", "name": f"memo:{name}", "ts": time.time(), "requests": 0, "bytes": 0, "rcu": 0.0,
+        "wall_ms": (time.perf_counter() - start) * 1000, "items": changed, "cache": "hit" if reused else "miss",
+    })
+    return output
+
+def _text(df, col, default):
+    # Column as strings; missing, NaN and blank values become default
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    values = df[col].astype(object)
+    text = values.astype(str)
+    return text.where(values.notna() & (text.str.strip() != ""), default)
+
+def _number(df, col, default):
+    if col not in df.columns:
+        return pd.Series(float(default), index=df.index)
+    return pd.Series(to_float(df[col].to_numpy()), index=df.index).fillna(default)
 
 def metric_card(title, value, subtitle=None, color="#e5e7eb", glow=False):
     return f"""
@@ -582,46 +783,13 @@ def metric_card(title, value, subtitle=None, color="#e5e7eb", glow=False):
 # =========================================================
 # PAGE 1: SMART RADAR
 # =========================================================
-def render_live_alerts(selected_date):
-    st_autorefresh(interval=60 * 1000, key="datarefresh")
-    
-    st.subheader("🚀 Smart Money Radar")
-    
-    # 1. Load History
-    history_items = load_todays_history_optimized(selected_date)
-    cumulative_scores_df = load_cumulative_scores(selected_date)
-    
-    if not history_items:
-        return
+RADAR_TABLE_COLUMNS = [
+    'Chart', 'Name', 'SmartRank', 'Latest Score', 'Peak_Score', 'Locked', 'Lock Time', 'Reentry', 'Break', 'Staircase',
+    'Entry Time', 'Entry Price', 'Current Price', 'Max Move %', 'Current Move %', 'OI %'
+]
 
-    # 2. Process
-    radar_df = process_radar_data(history_items, cumulative_scores_df)
-    locks = load_lock_data(selected_date)
-    lock_map = {x["Stock"]: x for x in locks}
-
-    radar_df["Locked"] = radar_df["Name"].apply(lambda x: "🔒" if x in lock_map else "")
-    radar_df["Lock Time"] = radar_df["Name"].apply(lambda x: lock_map[x]["Lock_Time"] if x in lock_map else "-")
-    radar_df["Reentry"] = radar_df["Name"].apply(lambda x: lock_map[x]["Reentry_Time"] if x in lock_map and lock_map[x].get("Reentry_Time") else "-")
-    if radar_df.empty:
-        return
-
-    # 3. Filter Top 20
-    display_df = radar_df.head(20).copy()
-    
-    # 4. Links
-    display_df['Cleaned_Name'] = display_df['Name'].replace(TICKER_CORRECTIONS)
-    display_df['TV_Symbol'] = DEFAULT_EXCHANGE + ":" + display_df['Cleaned_Name'].str.replace('&', '_').str.replace(' ', '')
-    display_df['Chart'] = "https://www.tradingview.com/chart/?symbol=" + display_df['TV_Symbol']
-
-    # 5. Smart Radar = Top 3 Spotlight
-    st.markdown("### 🏆 Top 3 Opportunities")
-    top3 = display_df.head(3)
-
-    if len(top3) >= 3:
-        cols = st.columns(3)
-        for i in range(3):
-            row = top3.iloc[i]
-            cols[i].markdown(f"""
+def build_spotlight_cards(top3):
+    return [f"""
             <div style="
             background:linear-gradient(145deg,#0f172a,#0b1220);
             border:1px solid rgba(0,255,200,.4);
@@ -636,14 +804,42 @@ def render_live_alerts(selected_date):
                 </div>
                 <div style="color:#9ca3af;">Smart Rank</div>
             </div>
-            """, unsafe_allow_html=True)
+            """ for _, row in top3.iterrows()]
+
+def build_radar_table(display_df):
+    display_df = display_df.copy()
+    display_df["Staircase"] = np.where(display_df["Staircase"], "🪜", "")
+    display_df[['TV_Symbol', 'Chart']] = get_ticker_index().links(display_df['Name'])[['TV_Symbol', 'Chart']]
+    return display_df[RADAR_TABLE_COLUMNS]
+
+@instrumented("render")
+def render_live_alerts(selected_date):
+    follow_changes("radar", selected_date, key="datarefresh")
+    
+    st.subheader("🚀 Smart Money Radar")
+    
+    # 1. Load History, Scores & Locks in parallel (radar only processes the snapshots since the last refresh)
+    page_data = load_radar_page(selected_date)
+    radar_df = page_data.radar
+    if radar_df.empty:
+        return
+
+    # 2. Top 20 with locks
+    display_df = join_locks(radar_df.head(20), page_data.locks, on="Name")
+
+    # 3. Spotlight cards and table, rebuilt only when their rows changed since this session's last render
+    cards = render_memo("radar_cards", display_df.head(3)[['Name', 'SmartRank']], build_spotlight_cards)
+    table = render_memo("radar_table", display_df, build_radar_table)
+
+    # 4. Smart Radar = Top 3 Spotlight
+    st.markdown("### 🏆 Top 3 Opportunities")
+    if len(cards) >= 3:
+        for col, card in zip(st.columns(3), cards):
+            col.markdown(card, unsafe_allow_html=True)
     st.divider()
 
     st.data_editor(
-        display_df[[
-            'Chart', 'Name', 'SmartRank', 'Latest Score', 'Peak_Score', 'Locked', 'Lock Time', 'Reentry', 'Break',
-            'Entry Time', 'Entry Price', 'Current Price', 'Max Move %', 'Current Move %', 'OI %'
-        ]],
+        table,
         column_config={
             "Chart": st.column_config.LinkColumn("View", display_text="📊", width="small"),
             "Name": st.column_config.TextColumn("Stock", width="medium"),
@@ -654,6 +850,7 @@ def render_live_alerts(selected_date):
             "Lock Time": st.column_config.TextColumn("Lock Time", width="small"),
             "Reentry": st.column_config.TextColumn("Reentry", width="small"),
             "Break": st.column_config.TextColumn("Lvl Break", width="small"),
+            "Staircase": st.column_config.TextColumn("Stairs", width="small"),
             "Entry Time": st.column_config.TextColumn("1st Signal", width="small"),
             "Entry Price": st.column_config.NumberColumn("Entry ₹", format="%.1f"),
             "Current Price": st.column_config.NumberColumn("CMP ₹", format="%.1f"),
@@ -669,48 +866,50 @@ def render_live_alerts(selected_date):
 # =========================================================
 # PAGE 2: MARKET VELOCITY (RESTORED)
 # =========================================================
-def render_intraday_boost(selected_date):
-    st.header("📈 Market Velocity")
+VELOCITY_COLUMNS = ['Chart', 'Name', 'SignalPrice', 'BreakType', 'OI_Change']
+VELOCITY_TOP_N = 20
 
-    df = load_data_from_dynamodb(selected_date, "INTRADAY_BOOST")
-    if df.empty:
-        return
+@dataclass
+class VelocityView:
+    bull: pd.DataFrame
+    bear: pd.DataFrame
+    bias_card: str
 
-    # Filter for latest time
-    if 'Time' in df.columns:
-        latest_time = df['Time'].max()
-        df = df[df['Time'] == latest_time].copy()
+def build_velocity_view(df):
+    """
+    Bullish / bearish top 20 by OI change and the market bias card for one time slice.
+    """
+    df = df.copy()
 
     # Prepare Data
     if 'Name' in df.columns:
-        df['Cleaned_Name'] = df['Name'].replace(TICKER_CORRECTIONS)
-        df['TV_Symbol'] = DEFAULT_EXCHANGE + ":" + df['Cleaned_Name'].str.replace(' ', '')
-        df['Chart'] = "https://www.tradingview.com/chart/?symbol=" + df['TV_Symbol']
-
-    # Classification
-    def classify_side(row):
-        # Use new 'Side' column if available, else derive
-        if 'Side' in row and pd.notnull(row['Side']): return str(row['Side']).upper()
-        # Fallback
-        r_type = str(row.get('RankType', '')).upper()
-        if 'TOP GAINER' in r_type: return 'BULLISH'
-        if 'TOP LOSER' in r_type: return 'BEARISH'
-        return 'NEUTRAL'
-
-    df['View_Side'] = df.apply(classify_side, axis=1)
-    
-    df_bull = df[df['View_Side'] == 'BULLISH'].sort_values('OI_Change', ascending=False).head(20)
-    df_bear = df[df['View_Side'] == 'BEARISH'].sort_values('OI_Change', ascending=False).head(20)
+        df[['TV_Symbol', 'Chart']] = get_ticker_index().links(df['Name'])[['TV_Symbol', 'Chart']]
+
+    # Classification: the 'Side' column where set, else derived from RankType
+    rank_type = _text(df, 'RankType', '').str.upper()
+    derived = np.select(
+        [rank_type.str.contains('TOP GAINER', regex=False), rank_type.str.contains('TOP LOSER', regex=False)],
+        ['BULLISH', 'BEARISH'], 'NEUTRAL'
+    )
+    side = df['Side'].astype(object) if 'Side' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    df['View_Side'] = side.astype(str).str.upper().where(side.notna(), derived)
+
+    # Top 20 of each side by OI change, in one partial selection per side
+    top = df.groupby('View_Side', sort=False)['OI_Change'].nlargest(VELOCITY_TOP_N)
+    top_side = top.index.get_level_values(0)
+    df_bull = df.loc[top.index.get_level_values(1)[top_side == 'BULLISH']]
+    df_bear = df.loc[top.index.get_level_values(1)[top_side == 'BEARISH']]
 
     # Market Bias Engine
     bull = len(df_bull)
     bear = len(df_bear)
+    bias_card = None
 
     if (bull + bear) > 0:
         bias = "BULLISH" if bull > bear else "BEARISH"
         bias_color = "#00ffcc" if bull > bear else "#ff4d4d"
 
-        st.markdown(f"""
+        bias_card = f"""
         <div style="
         background:linear-gradient(145deg,#0f172a,#0b1220);
         border:1px solid {bias_color};
@@ -727,17 +926,29 @@ def render_intraday_boost(selected_date):
         Bull: {bull} | Bear: {bear}
         </p>
         </div>
-        """, unsafe_allow_html=True)
+        """
 
+    return VelocityView(bull=df_bull[VELOCITY_COLUMNS], bear=df_bear[VELOCITY_COLUMNS], bias_card=bias_card)
 
-    col1, col2 = st.columns(2)
+@instrumented("render")
+def render_intraday_boost(selected_date):
+    st.header("📈 Market Velocity")
 
-    display_cols = ['Chart', 'Name', 'SignalPrice', 'BreakType', 'OI_Change']
+    # Newest tick only, looked up by Time
+    df = load_latest_live_slice(selected_date, "INTRADAY_BOOST", VELOCITY_ATTRIBUTES)
+    if df.empty:
+        return
+
+    view = render_memo("velocity", df, build_velocity_view)
+    if view.bias_card:
+        st.markdown(view.bias_card, unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("#### 🟢 Bullish Momentum")
         st.data_editor(
-            df_bull[display_cols],
+            view.bull,
             column_config={
                 "Chart": st.column_config.LinkColumn("View", display_text="📈", width="small"),
                 "Name": st.column_config.TextColumn("Name", width="medium"),
@@ -751,7 +962,7 @@ def render_intraday_boost(selected_date):
     with col2:
         st.markdown("#### 🔴 Bearish Momentum")
         st.data_editor(
-            df_bear[display_cols],
+            view.bear,
             column_config={
                 "Chart": st.column_config.LinkColumn("View", display_text="📉", width="small"),
                 "Name": st.column_config.TextColumn("Name", width="medium"),
@@ -765,12 +976,13 @@ def render_intraday_boost(selected_date):
 # =========================================================
 # PAGE 3: SECTOR VIEW
 # =========================================================
+@instrumented("render")
 def render_sector_view():
     st.header("📊 Sector Heatmap")
     df = load_nse_sector_data()
     if df.empty: return
 
-    df['Sector'] = df['symbol'].map(SECTOR_MAP).fillna('Others')
+    df['Sector'] = get_ticker_index().links(df['symbol'])['Sector']
     cols = ['pChangeInOpenInterest', 'lastPrice']
     for c in cols: 
         if c in df.columns: df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0)
@@ -782,85 +994,9 @@ def render_sector_view():
 # =========================================================
 # PAGE 4: AI SIGNAL DASHBOARD (UPDATED)
 # =========================================================
-def render_ai_signals_view(selected_date):
-    import traceback
-    try:
-        st_autorefresh(interval=60 * 1000, key="datarefresh_ai")
-        st.markdown("### 🧠 AI Verdicts Dashboard")
-        
-        # 1. LOAD REGISTRY (The Source of Truth)
-        registry = load_daily_ai_registry(selected_date)
-        
-        # 2. SMART FETCH STRATEGY
-        ai_df = load_data_from_dynamodb(selected_date)
+AI_CARDS_PER_PAGE = 10
 
-        if ai_df.empty:
-            return
-            
-        # 3. Filter Logic
-        # Filter 1: Must be the Live Signal SK
-        if 'SK' in ai_df.columns:
-            ai_df = ai_df[ai_df['SK'] == 'SIGNAL#INTRADAY_BOOST#LIVE'].copy()
-            
-        # Filter 2: Must be in Registry OR Explicitly Selected
-        # This handles cases where Scan returns many items but we only want the AI ones
-        if 'Name' in ai_df.columns:
-            is_in_registry = ai_df['Name'].isin(registry)
-            is_selected = False
-            if 'AI_Decision' in ai_df.columns:
-                is_selected = ai_df['AI_Decision'].isin(['AI_SELECTED', 'FALLBACK_SELECTED'])
-            
-            ai_df = ai_df[is_in_registry | is_selected].copy()
-        
-        if ai_df.empty:
-            return
-            
-        # 4. Load Locks & Sort
-        locks = load_lock_data(selected_date)
-        lock_map = {x.get("Stock", ""): x for x in locks}
-        
-        if 'Time' in ai_df.columns:
-            ai_df = ai_df.sort_values(by='Time', ascending=False)
-            
-        # 5. Render Cards
-        for _, row in ai_df.iterrows():
-            decision = str(row.get('AI_Decision', 'N/A'))
-            stock_name = str(row.get('Name', row.get('InstrumentKey', 'Unknown')))
-            
-            # Recovery Label
-            if decision == 'N/A' and stock_name in registry:
-                decision = "AI_SELECTED (Recall)"
-            
-            ai_time = str(row.get('Signal_Generated_At', row.get('Time', '-')))
-            if pd.isna(ai_time) or ai_time.strip() in ["", "nan"]: ai_time = str(row.get('Time', '-'))
-                
-            # Extract New Fields
-            target = row.get('Target', 'N/A')
-            stoploss = row.get('StopLoss', 'N/A')
-            risk_reward = row.get('RiskReward', 'N/A')
-            
-            if target == 'N/A' and "Recall" in decision:
-                target = "See Telegram" # Fallback if data was overwritten
-            
-            # Options
-            pcr = row.get('Option_PCR', '-')
-            max_pain = row.get('Option_MaxPain', '-')
-            res = row.get('Option_Res', '-')
-            sup = row.get('Option_Sup', '-')
-            
-            # AI Card
-            confidence = row.get("AI_Confidence", 82)
-            live_move = row.get("Live_Move", 0.0)
-
-            glow_color = "#00ffcc" if confidence > 75 else "#fbbf24"
-            
-            try:
-                oi_change = float(row.get('OI_Change', 0))
-            except (ValueError, TypeError):
-                oi_change = 0
-
-
-            st.markdown(f"""
+AI_CARD_TEMPLATE = """
             <div style="
             border:1px solid {glow_color};
             background:linear-gradient(145deg,#0f172a,#0b1220);
@@ -876,7 +1012,7 @@ def render_ai_signals_view(selected_date):
                         {stock_name}
                     </h2>
                     <span style="color:#9ca3af;font-size:13px;">
-                        Signal Time: {ai_time}
+                        Signal Time: {ai_time}{lock_note}
                     </span>
                 </div>
                 <div style="
@@ -886,7 +1022,7 @@ def render_ai_signals_view(selected_date):
                     font-weight:800;
                     color:#0a0f1c;
                 ">
-                    {decision.replace('_',' ')}
+                    {decision_label}
                 </div>
             </div>
 
@@ -900,7 +1036,7 @@ def render_ai_signals_view(selected_date):
             color:#e5e7eb;
             font-style:italic;
             ">
-            🧠 {row.get('AI_Reason')}
+            🧠 {reason}
             </div>
 
             <div style="display:grid;grid-template-columns:repeat(4,1fr);gap:16px;margin-bottom:20px;">
@@ -910,38 +1046,146 @@ def render_ai_signals_view(selected_date):
                 <div>
                     <b>CONFIDENCE</b>
                     <div style="background:#1f2937;border-radius:6px;height:8px;margin-top:4px;">
-                        <div style="width:{confidence}%;background:{glow_color};height:8px;border-radius:6px;"></div>
+                        <div style="width:{confidence:g}%;background:{glow_color};height:8px;border-radius:6px;"></div>
                     </div>
-                    {confidence}%
+                    {confidence:g}%
                 </div>
             </div>
 
             <div style="display:grid;grid-template-columns:repeat(4,1fr);gap:16px;font-size:14px;">
-                <div>Live Move: <span style="color:{'#00ffcc' if live_move>0 else '#ff4d4d'};">{live_move:.2f}%</span></div>
+                <div>Live Move: <span style="color:{move_color};">{live_move:.2f}%</span></div>
                 <div>OI: {oi_change}%</div>
                 <div>PCR: {pcr}</div>
                 <div>Walls: {res}/{sup}</div>
             </div>
 
             </div>
-            """, unsafe_allow_html=True)
+            """
+
+def ai_card_fields(ai_df, registry):
+    """
+    Everything an AI card shows, one column per template field, computed column-wise for all signals.
+    """
+    name = _text(ai_df, 'Name', None).fillna(_text(ai_df, 'InstrumentKey', 'Unknown'))
+    decision = _text(ai_df, 'AI_Decision', 'N/A')
+
+    # Recovery Label
+    recalled = (decision == 'N/A') & name.isin(registry)
+    decision = decision.where(~recalled, "AI_SELECTED (Recall)")
+
+    # Target falls back to Telegram when the live item was overwritten
+    target = _text(ai_df, 'Target', 'N/A')
+    target = target.where(~(recalled & (target == 'N/A')), "See Telegram")
+
+    confidence = _number(ai_df, 'AI_Confidence', 82)
+    live_move = _number(ai_df, 'Live_Move', 0.0)
+    locked = ai_df['Locked'].astype(bool) if 'Locked' in ai_df.columns else pd.Series(False, index=ai_df.index)
+
+    return pd.DataFrame({
+        'stock_name': name,
+        'ai_time': _text(ai_df, 'Signal_Generated_At', None).fillna(_text(ai_df, 'Time', '-')),
+        'lock_note': np.where(locked, " · 🔒 Locked " + _text(ai_df, 'Lock Time', '-'), ""),
+        'decision_label': decision.str.replace('_', ' '),
+        'reason': _text(ai_df, 'AI_Reason', ''),
+        'target': target,
+        'stoploss': _text(ai_df, 'StopLoss', 'N/A'),
+        'risk_reward': _text(ai_df, 'RiskReward', 'N/A'),
+        'confidence': confidence,
+        'glow_color': np.where(confidence > 75, "#00ffcc", "#fbbf24"),
+        'live_move': live_move,
+        'move_color': np.where(live_move > 0, "#00ffcc", "#ff4d4d"),
+        'oi_change': _number(ai_df, 'OI_Change', 0),
+        'pcr': _text(ai_df, 'Option_PCR', '-'),
+        'res': _text(ai_df, 'Option_Res', '-'),
+        'sup': _text(ai_df, 'Option_Sup', '-'),
+    }, index=ai_df.index)
+
+def card_page_label(page, total):
+    first, last = (page - 1) * AI_CARDS_PER_PAGE + 1, min(page * AI_CARDS_PER_PAGE, total)
+    return f"{first}–{last}" if last > first else str(first)
+
+def build_ai_cards(fields):
+    """
+    Card HTML for each row of fields. Cards are cached per session by content, so a rerun only formats
+    the cards whose verdict, target, move or any other field changed.
+    """
+    hashes = pd.util.hash_pandas_object(fields, index=False).to_numpy()
+    cached = st.session_state.get("ai_card_html", {})
+    cards = {h: cached.get(h) or AI_CARD_TEMPLATE.format(**row) for h, row in zip(hashes, fields.to_dict("records"))}
+    st.session_state["ai_card_html"] = cards
+    return [cards[h] for h in hashes]
+
+@instrumented("render")
+def render_ai_signals_view(selected_date):
+    import traceback
+    try:
+        follow_changes("signals", selected_date, key="datarefresh_ai")
+        st.markdown("### 🧠 AI Verdicts Dashboard")
+        
+        # 1. LOAD REGISTRY (The Source of Truth), LIVE SIGNALS & LOCKS in parallel
+        page_data = load_ai_page(selected_date)
+        registry = page_data.registry
+        
+        # 2. SMART FETCH STRATEGY
+        ai_df = page_data.signals
+
+        if ai_df.empty:
+            return
+            
+        # 3. Filter Logic
+        # Filter 1: Must be the Live Signal SK
+        if 'SK' in ai_df.columns:
+            ai_df = ai_df[ai_df['SK'] == 'SIGNAL#INTRADAY_BOOST#LIVE'].copy()
+            
+        # Filter 2: Must be in Registry OR Explicitly Selected
+        # This handles cases where Scan returns many items but we only want the AI ones
+        if 'Name' in ai_df.columns:
+            is_in_registry = ai_df['Name'].isin(registry)
+            is_selected = False
+            if 'AI_Decision' in ai_df.columns:
+                is_selected = ai_df['AI_Decision'].isin(['AI_SELECTED', 'FALLBACK_SELECTED'])
+            
+            ai_df = ai_df[is_in_registry | is_selected].copy()
+        
+        if ai_df.empty:
+            return
+            
+        # 4. Locks & Sort
+        if 'Name' in ai_df.columns:
+            ai_df = join_locks(ai_df, page_data.locks, on='Name')
+        
+        if 'Time' in ai_df.columns:
+            ai_df = ai_df.sort_values(by='Time', ascending=False)
+            
+        # 5. Render Cards: one page at a time, only cards whose fields changed are re-formatted
+        fields = ai_card_fields(ai_df, registry)
+        pages = max(1, -(-len(fields) // AI_CARDS_PER_PAGE))
+        page = 1
+        if pages > 1:
+            page = st.radio(
+                "Page", range(1, pages + 1), horizontal=True, key="ai_card_page",
+                format_func=lambda p: card_page_label(p, len(fields))
+            )
+        visible = fields.iloc[(page - 1) * AI_CARDS_PER_PAGE:page * AI_CARDS_PER_PAGE]
+        for card in render_memo("ai_cards", visible, build_ai_cards):
+            st.markdown(card, unsafe_allow_html=True)
 
     except Exception as e:
         st.error("🚨 CRITICAL ERROR: The AI Signal page crashed.")
         st.code(traceback.format_exc(), language="python")
 
+@instrumented("render")
 def render_swing_dashboard(selected_date):
 
     st.header("📊 Swing Trading Engine")
     st.info("Daily Hybrid Adaptive Swing Model")
 
-    swing_items = load_swing_candidates(selected_date)
+    df = load_swing_candidates(selected_date)
 
-    if not swing_items:
+    if df.empty:
         st.warning("No swing candidate stored for this date.")
         return
 
-    df = pd.DataFrame(swing_items)
     if "Symbol" not in df.columns:
         df["Symbol"] = df["Name"] if "Name" in df.columns else "-"
     if "Direction" not in df.columns:
@@ -965,13 +1209,11 @@ def render_swing_dashboard(selected_date):
         df["Entry Trigger Time"] = "-"
 
     df["Entry Trigger Time"] = df["Entry Trigger Time"].fillna("-")
-    df["Confidence"] = pd.to_numeric(df["Confidence"], errors="coerce").fillna(0).clip(0, 100)
-    df["Close"] = pd.to_numeric(df["Close"], errors="coerce")
+    df["Confidence"] = df["Confidence"].astype(float).fillna(0).clip(0, 100)
+    df["Close"] = df["Close"].astype(float)
 
     # TradingView link
-    df["Cleaned_Name"] = df["Symbol"].replace(TICKER_CORRECTIONS)
-    df["TV_Symbol"] = DEFAULT_EXCHANGE + ":" + df["Cleaned_Name"].str.replace(" ", "")
-    df["Chart"] = "https://www.tradingview.com/chart/?symbol=" + df["TV_Symbol"]
+    df[["TV_Symbol", "Chart"]] = get_ticker_index().links(df["Symbol"])[["TV_Symbol", "Chart"]]
 
     st.data_editor(
         df[[
@@ -998,17 +1240,15 @@ def render_swing_dashboard(selected_date):
         hide_index=True
     )
 
+@instrumented("render")
 def render_swing_analytics():
 
     st.header("📈 Swing Performance Analytics")
 
     try:
-        dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+        dynamodb = get_dynamodb()
         sent_alerts_table = dynamodb.Table(DYNAMODB_TABLE)
-        resp = sent_alerts_table.query(
-            KeyConditionExpression=Key('PK').eq("SWING_HISTORY")
-        )
-        items = resp.get("Items", [])
+        items = list(query_partition(sent_alerts_table, "SWING_HISTORY"))
     except Exception as e:
         st.error(f"Error loading swing analytics: {e}")
         items = []
@@ -1017,10 +1257,7 @@ def render_swing_analytics():
         st.warning("No closed swing trades yet.")
         return
 
-    df = pd.DataFrame(items)
-
-    df["ReturnPct"] = pd.to_numeric(df["ReturnPct"])
-    df["Holding_Days"] = pd.to_numeric(df["Holding_Days"])
+    df = items_frame(items, SWING_HISTORY_SCHEMA)
 
     total_trades = len(df)
     win_rate = (df["ReturnPct"] > 0).mean() * 100
@@ -1064,52 +1301,116 @@ def render_swing_analytics():
     ])
 
 # =========================================================
-# MAIN
+# DIAGNOSTICS PANEL
 # =========================================================
-with st.sidebar:
-    st.markdown("""
-    <div style="
-    background: linear-gradient(135deg,#00ffcc,#00b8ff);
-    border-radius:18px;
-    padding:2rem;
-    text-align:center;
-    box-shadow:0 15px 40px rgba(0,255,200,.25);
-    ">
-    <h1 style="margin:0;color:#0a0f1c;font-size:2.8rem;font-weight:900;">
-    QUANT RADAR
-    </h1>
-    <p style="margin:0;color:#0a0f1c;font-weight:600;">
-    AI-Powered Institutional Intelligence
-    </p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # UPDATED MENU
-    page = st.radio(
-        "Navigate",
-        [
-            "🚀 Smart Radar",
-            "📊 Swing Trading",
-            "📈 Swing Analytics",
-            "🧠 AI SIGNAL",
-            "📈 Market Velocity",
-            "📊 Sector Heatmap"
-        ]
+def render_diagnostics_panel():
+    events = pd.DataFrame(instrumentation.snapshot())
+    st.markdown("#### 🩺 Hot Path")
+    if events.empty:
+        st.caption("No calls recorded yet.")
+        return
+
+    if "cache" not in events.columns:
+        events["cache"] = None
+    events["hit"] = events["cache"] == "hit"
+    events["miss"] = events["cache"] == "miss"
+
+    stats = events.groupby(["kind", "name"]).agg(
+        calls=("wall_ms", "size"),
+        p50_ms=("wall_ms", "median"),
+        p95_ms=("wall_ms", lambda x: x.quantile(0.95)),
+        last_ms=("wall_ms", "last"),
+        items=("items", "last"),
+        kb=("bytes", lambda x: x.sum() / 1024),
+        rcu=("rcu", "sum"),
+        hits=("hit", "sum"),
+        misses=("miss", "sum"),
+    ).reset_index()
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = np.where(lookups > 0, stats["hits"] / lookups.where(lookups > 0, 1) * 100, np.nan)
+    stats = stats.drop(columns=["hits", "misses"]).sort_values(["kind", "p95_ms"], ascending=[True, False])
+
+    st.dataframe(
+        stats,
+        column_config={
+            "p50_ms": st.column_config.NumberColumn("p50 ms", format="%.0f"),
+            "p95_ms": st.column_config.NumberColumn("p95 ms", format="%.0f"),
+            "last_ms": st.column_config.NumberColumn("last ms", format="%.0f"),
+            "kb": st.column_config.NumberColumn("KB", format="%.0f"),
+            "rcu": st.column_config.NumberColumn("RCU", format="%.1f"),
+            "hit_rate": st.column_config.NumberColumn("Hit %", format="%.0f%%"),
+        },
+        hide_index=True, use_container_width=True
     )
-    
-    india_tz = pytz.timezone('Asia/Kolkata')
-    selected_date = st.date_input("📅 Select Date", datetime.now(india_tz).date())
-    if st.button("🔄 Refresh"): st.cache_data.clear(); st.rerun()
-
-if page == "🚀 Smart Radar":
-    render_live_alerts(selected_date)
-elif page == "📊 Swing Trading":
-    render_swing_dashboard(selected_date)
-elif page == "📈 Swing Analytics":
-    render_swing_analytics()
-elif page == "🧠 AI SIGNAL":
-    render_ai_signals_view(selected_date)
-elif page == "📈 Market Velocity":
-    render_intraday_boost(selected_date)
-elif page == "📊 Sector Heatmap":
-    render_sector_view()
+    st.caption(f"Snapshots decoded: {DECODE_STATS['decoded']} | malformed: {DECODE_STATS['malformed']}")
+    st.caption(f"Batch-get keys not read: unprocessed {BATCH_GET_STATS['unprocessed']} | failed {BATCH_GET_STATS['failed']}")
+    feed = get_change_feed()
+    if feed:
+        last_change = datetime.fromtimestamp(feed.last_change_at, INDIA_TZ).strftime("%H:%M:%S") if feed.last_change_at else "-"
+        st.caption(f"Change feed: {'running' if feed.running else 'stopped'} | records: {feed.records_seen} | last change: {last_change}"
+                   + (f" | error: {feed.last_error}" if feed.last_error else ""))
+    st.download_button("⬇️ Export log", instrumentation.export_jsonl(), file_name="radar_metrics.jsonl", mime="application/json")
+
+# =========================================================
+# MAIN
+# =========================================================
+def main():
+    get_radar_poller()
+    get_change_feed()
+
+    with st.sidebar:
+        st.markdown("""
+        <div style="
+        background: linear-gradient(135deg,#00ffcc,#00b8ff);
+        border-radius:18px;
+        padding:2rem;
+        text-align:center;
+        box-shadow:0 15px 40px rgba(0,255,200,.25);
+        ">
+        <h1 style="margin:0;color:#0a0f1c;font-size:2.8rem;font-weight:900;">
+        QUANT RADAR
+        </h1>
+        <p style="margin:0;color:#0a0f1c;font-weight:600;">
+        AI-Powered Institutional Intelligence
+        </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # UPDATED MENU
+        page = st.radio(
+            "Navigate",
+            [
+                "🚀 Smart Radar",
+                "📊 Swing Trading",
+                "📈 Swing Analytics",
+                "🧠 AI SIGNAL",
+                "📈 Market Velocity",
+                "📊 Sector Heatmap"
+            ]
+        )
+
+        selected_date = st.date_input("📅 Select Date", datetime.now(INDIA_TZ).date())
+        # Refresh only this session's data: cached entries older than the click are refetched for this viewer
+        if st.button("🔄 Refresh"): st.session_state["refresh_ts"] = time.time(); st.rerun()
+        shared_cache.FRESH_AFTER.set(st.session_state.get("refresh_ts", 0.0))
+        show_diagnostics = st.checkbox("🩺 Diagnostics", value=False)
+
+    if page == "🚀 Smart Radar":
+        render_live_alerts(selected_date)
+    elif page == "📊 Swing Trading":
+        render_swing_dashboard(selected_date)
+    elif page == "📈 Swing Analytics":
+        render_swing_analytics()
+    elif page == "🧠 AI SIGNAL":
+        render_ai_signals_view(selected_date)
+    elif page == "📈 Market Velocity":
+        render_intraday_boost(selected_date)
+    elif page == "📊 Sector Heatmap":
+        render_sector_view()
+
+    if show_diagnostics:
+        with st.sidebar:
+            render_diagnostics_panel()
+
+if __name__ == "__main__":
+    main()